@@ -0,0 +1,55 @@
+"""
+Benchmark hitung progress: openpyxl (load_workbook penuh) vs pembaca XML streaming.
+
+    python bench_progress.py            # 10k dan 100k baris
+    python bench_progress.py 5000 50000
+"""
+import os
+import sys
+import tempfile
+import time
+
+import openpyxl
+from openpyxl import Workbook
+
+from todocore import HEADER, count_workbook_sections, stream_section_progress
+
+
+def make_workbook(path, rows):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Default")
+    ws.append(HEADER)
+    for i in range(rows):
+        ws.append([f"Task {i}", i % 3 == 0 and 1 or 0, f"catatan {i}", f"2025-{i % 12 + 1:02d}-01"])
+    wb.save(path)
+
+
+def openpyxl_full(path):
+    # jalur lama calc_todo_progress
+    return count_workbook_sections(openpyxl.load_workbook(path))
+
+
+def timed(fn, path, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(path)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, result
+
+
+def main(sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>8} {'openpyxl':>10} {'streaming':>10} {'speedup':>8}")
+        for rows in sizes:
+            path = os.path.join(tmp, f"bench_{rows}.xlsx")
+            make_workbook(path, rows)
+            t_full, r_full = timed(openpyxl_full, path)
+            t_fast, r_fast = timed(stream_section_progress, path)
+            assert r_full == r_fast, (r_full, r_fast)
+            print(f"{rows:>8} {t_full:>9.3f}s {t_fast:>9.3f}s {t_full / t_fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,21 @@
+"""DateIndex: daftar bulan dan filter bulan/hari/rentang."""
+from todocore import DateIndex
+
+
+def test_date_index():
+    index = DateIndex()
+    index.put("a", "2025-09-01")
+    index.put("b", "2025-09-15")
+    index.put("c", "2025-10-01")
+    index.put("d", "")
+    assert index.months() == ["2025-09", "2025-10"]
+    assert index.month("2025-09") == {"a", "b"}
+    assert index.day("2025-09-15") == {"b"}
+    assert index.between("2025-09-10", "2025-10") == {"b", "c"}
+    assert index.between() == {"a", "b", "c"}
+
+    index.put("c", "2025-09-02")
+    index.remove("a")
+    assert index.months() == ["2025-09"]
+    assert index.month("2025-09") == {"b", "c"}
+    assert index.month("2025-10") == set()
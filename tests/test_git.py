@@ -0,0 +1,47 @@
+"""Filter event GitWatcher dan parser git status porcelain v2."""
+import os
+from types import SimpleNamespace
+
+from todocore import GitWatcher, git_file_state, parse_porcelain_v2
+
+
+def test_watcher_ignores_reads(tmp_path):
+    touched = []
+    watcher = GitWatcher(str(tmp_path), lambda: None)
+    watcher.touch = lambda: touched.append(True)
+
+    def event(kind, name):
+        return SimpleNamespace(event_type=kind, is_directory=False, src_path=str(tmp_path / name))
+
+    for kind in ("opened", "closed_no_write"):
+        watcher.dispatch(event(kind, ".git/HEAD"))
+        watcher.dispatch(event(kind, "Satu.xlsx"))
+    assert touched == []
+    watcher.dispatch(event("modified", "Satu.xlsx"))
+    watcher.dispatch(event("modified", "Satu.xlsx.journal"))
+    assert touched == [True]
+
+
+def test_parse_porcelain_v2(tmp_path):
+    root = str(tmp_path)
+    out = "\0".join([
+        "# branch.oid 123",
+        "1 .M N... 100644 100644 100644 aaa bbb data/todolist/Satu.xlsx",
+        "2 R. N... 100644 100644 100644 aaa bbb R100 data/todolist/Baru.xlsx",
+        "data/todolist/Lama.xlsx",
+        "u UU N... 100644 100644 100644 100644 aaa bbb ccc data/todolist/Dua.xlsx",
+        "? data/todolist/Tiga.xlsx",
+        "? data/arsip/",
+        "",
+    ])
+    states = parse_porcelain_v2(out, root)
+
+    def state(rel):
+        return git_file_state(states, os.path.join(root, *rel.split("/")))
+
+    assert state("data/todolist/Satu.xlsx") == "modified"
+    assert state("data/todolist/Baru.xlsx") == "modified"
+    assert state("data/todolist/Lama.xlsx") is None
+    assert state("data/todolist/Dua.xlsx") == "conflict"
+    assert state("data/todolist/Tiga.xlsx") == "untracked"
+    assert state("data/arsip/Empat.xlsx") == "untracked"
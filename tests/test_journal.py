@@ -0,0 +1,153 @@
+"""Journal xlsx: replay setelah crash, baris terpotong, op gagal, pemadatan ke xlsx."""
+import json
+import os
+import time
+
+import pytest
+
+from todocore import JOURNAL_COMPACT_OPS, XlsxTodoStore, file_hash
+
+
+def crash(store):
+    """Tinggalkan store tanpa menyimpan: yang tersisa hanya xlsx lama + journal."""
+    store.hold_saves()
+    for journal in store.journals.values():
+        journal.close()
+
+
+def names(store, todo="A", section="Default"):
+    return [t.task for t in store.tasks(todo, section)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = XlsxTodoStore(str(tmp_path))
+    store.create_todo("A")
+    return store
+
+
+def test_replay_after_crash(store, tmp_path):
+    store.add_task("A", "Default", "satu")
+    key = store.add_task("A", "Default", "dua")
+    store.set_status("A", "Default", key, 1)
+    crash(store)
+
+    reopened = XlsxTodoStore(str(tmp_path))
+    assert names(reopened) == ["satu", "dua"]
+    assert reopened.get_task("A", "Default", key).status == 1
+    reopened.close()
+    assert not os.path.exists(reopened.path("A") + ".journal")
+
+
+def test_truncated_last_line_is_dropped(store, tmp_path):
+    store.add_task("A", "Default", "satu")
+    crash(store)
+    journal = store.path("A") + ".journal"
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "sheet": "Def')  # crash di tengah append
+
+    reopened = XlsxTodoStore(str(tmp_path))
+    assert names(reopened) == ["satu"]
+    with open(journal, encoding="utf-8") as f:
+        assert all(json.loads(line) for line in f)
+    reopened.close()
+
+
+@pytest.mark.parametrize("bad", ["a/b", "x[1]", "a" * 32, ""])
+def test_invalid_section_is_not_journaled(store, tmp_path, bad):
+    store.add_task("A", "Default", "first")
+    with pytest.raises(ValueError):
+        store.add_section("A", bad)
+    store.add_task("A", "Default", "after-bad")
+    crash(store)
+
+    reopened = XlsxTodoStore(str(tmp_path))
+    assert names(reopened) == ["first", "after-bad"]
+    assert reopened.sections("A") == ["Default"]
+    reopened.close()
+
+
+def test_failed_replay_discards_half_applied_workbook(store, tmp_path):
+    store.add_task("A", "Default", "tersimpan")
+    store.close()
+    path = store.path("A")
+    before = file_hash(path)
+    with open(path + ".journal", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"base": before}) + "\n")
+        f.write(json.dumps({"op": "add", "sheet": "Default", "row": ["setengah", 0, "", "", "id1"]}) + "\n")
+        f.write(json.dumps({"op": "rename_section", "sheet": "Tidak Ada", "new": "X"}) + "\n")
+
+    reopened = XlsxTodoStore(str(tmp_path))
+    assert names(reopened) == ["tersimpan"]
+    assert not reopened.cache.is_dirty(path)
+    reopened.close()
+    assert file_hash(path) == before
+    assert any(".journal.orphan-" in n for n in os.listdir(tmp_path))
+
+
+def test_journal_for_other_base_is_set_aside(store, tmp_path):
+    store.add_task("A", "Default", "lama")
+    crash(store)
+    other = XlsxTodoStore(str(tmp_path / "lain"))
+    other.create_todo("A")
+    other.add_task("A", "Default", "dari remote")
+    other.close()
+    os.replace(other.path("A"), store.path("A"))  # mis. git pull mengganti xlsx
+
+    reopened = XlsxTodoStore(str(tmp_path))
+    assert names(reopened) == ["dari remote"]
+    assert any(".journal.orphan-" in n for n in os.listdir(tmp_path))
+    reopened.close()
+
+
+def test_edits_reach_xlsx_after_quiet_period(store):
+    path = store.path("A")
+    before = file_hash(path)
+    for i in range(20):
+        store.add_task("A", "Default", f"t{i}")
+    time.sleep(store.save_queue.delay + 1)
+    assert file_hash(path) != before
+    assert not os.path.exists(path + ".journal")
+    assert not store.cache.is_dirty(path)
+    store.close()
+
+
+def test_long_journal_is_compacted_without_quiet_period(store):
+    store.save_queue.delay = 60  # edit tanpa henti: jeda tenang tidak pernah tercapai
+    path = store.path("A")
+    for i in range(JOURNAL_COMPACT_OPS):
+        store.add_task("A", "Default", f"t{i}")
+    deadline = time.monotonic() + 10
+    while store.cache.is_dirty(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not store.cache.is_dirty(path)
+    store.close()
+
+
+def test_save_leaves_no_temp_file(store, tmp_path):
+    store.add_task("A", "Default", "x")
+    assert store.flush(timeout=5)
+    assert sorted(n for n in os.listdir(tmp_path) if n.startswith("A.")) == ["A.xlsx"]
+    store.close()
+
+
+def test_rename_is_refused_while_changes_cannot_be_saved(store, tmp_path, monkeypatch):
+    store.add_task("A", "Default", "belum-tersimpan")
+
+    def locked(path, wb):
+        raise PermissionError("file dibuka di Excel")
+
+    monkeypatch.setattr(store.cache, "save", locked)
+    with pytest.raises(OSError):
+        store.rename_todo("A", "B")
+    assert store.exists("A") and not store.exists("B")
+
+    monkeypatch.undo()
+    store.rename_todo("A", "B")
+    assert names(store, "B") == ["belum-tersimpan"]
+    assert not os.path.exists(store.path("A") + ".journal")
+    store.close()
+
+    reopened = XlsxTodoStore(str(tmp_path))
+    assert names(reopened, "B") == ["belum-tersimpan"]
+    reopened.close()
@@ -0,0 +1,130 @@
+"""SaveQueue: simpan tertunda digabung, flush, hold/release selama git jalan."""
+import os
+import time
+
+import pytest
+
+from todocore import SaveQueue, WorkbookCache, XlsxTodoStore, create_new_todo_excel
+
+
+def make_queue(tmp_path, delay=0.2):
+    path = str(tmp_path / "A.xlsx")
+    create_new_todo_excel(path)
+    cache, saved = WorkbookCache(), []
+    queue = SaveQueue(cache, delay=delay, on_saved=lambda p, wb: saved.append(p))
+    return path, cache, queue, saved
+
+
+def test_edits_are_merged_into_one_save(tmp_path):
+    path, cache, queue, saved = make_queue(tmp_path)
+    wb = cache.get(path)
+    for i in range(10):
+        wb["Default"].append([f"t{i}", 0])
+        queue.schedule(path, wb)
+        time.sleep(0.02)
+    assert saved == []
+    assert cache.is_dirty(path)
+
+    time.sleep(queue.delay + 0.5)
+    assert saved == [os.path.abspath(path)]
+    assert not cache.is_dirty(path)
+    queue.close()
+
+
+def test_flush_saves_without_waiting(tmp_path):
+    path, cache, queue, saved = make_queue(tmp_path, delay=60)
+    wb = cache.get(path)
+    wb["Default"].append(["x", 0])
+    queue.schedule(path, wb)
+    assert queue.flush(timeout=5)
+    assert saved == [os.path.abspath(path)]
+    queue.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = XlsxTodoStore(str(tmp_path))
+    store.create_todo("A")
+    yield store
+    if store.save_queue._held:
+        store.release_saves()
+    store.close(timeout=5)
+
+
+def mtime(store):
+    return os.stat(store.path("A")).st_mtime_ns
+
+
+def names(store):
+    return [t.task for t in store.tasks("A", "Default")]
+
+
+def test_hold_during_quiet_wait_blocks_save(store):
+    before = mtime(store)
+    store.add_task("A", "Default", "x")
+    time.sleep(0.1)  # worker sedang menunggu jeda tenang, belum busy
+    store.hold_saves()
+    time.sleep(store.save_queue.delay + 0.7)
+    assert mtime(store) == before
+
+    store.release_saves()
+    assert store.flush(timeout=5)
+    assert mtime(store) != before
+
+
+def test_flush_while_held_times_out(store):
+    store.add_task("A", "Default", "x")
+    store.hold_saves()
+    t0 = time.monotonic()
+    assert not store.flush(timeout=0.2)
+    assert time.monotonic() - t0 < 2
+    store.release_saves()
+    assert store.flush(timeout=5)
+
+
+def test_close_while_held_keeps_changes_in_journal(store, tmp_path):
+    before = mtime(store)
+    store.add_task("A", "Default", "x")
+    store.hold_saves()
+    store.close(timeout=0)
+    time.sleep(store.save_queue.delay + 0.3)
+    assert mtime(store) == before
+
+    reopened = XlsxTodoStore(str(tmp_path))
+    assert names(reopened) == ["x"]
+    reopened.close()
+
+
+def test_edit_during_push_is_saved_after_release(store):
+    store.add_task("A", "Default", "lokal")
+    assert store.flush(timeout=5)
+    store.hold_saves()
+    store.add_task("A", "Default", "saat push")
+    store.release_saves()
+    assert store.flush(timeout=5)
+    assert names(XlsxTodoStore(os.path.dirname(store.path("A")))) == ["lokal", "saat push"]
+
+
+def test_edit_during_pull_does_not_overwrite_pulled_file(store, tmp_path):
+    store.add_task("A", "Default", "lokal")
+    assert store.flush(timeout=5)
+    remote = XlsxTodoStore(str(tmp_path / "remote"))
+    remote.create_todo("A")
+    remote.add_task("A", "Default", "lokal")
+    remote.add_task("A", "Default", "dari remote")
+    remote.close()
+    errors = []
+    store.events.subscribe("save_state", lambda state, detail="": errors.append(detail) if state == "error" else None)
+
+    store.hold_saves()
+    store.add_task("A", "Default", "saat pull")
+    os.replace(remote.path("A"), store.path("A"))  # git pull menulis ulang xlsx
+    store.release_saves()
+    store.flush(timeout=5)
+
+    assert names(store) == ["lokal", "dari remote"]
+    assert names(XlsxTodoStore(str(tmp_path))) == ["lokal", "dari remote"]
+    orphans = [n for n in os.listdir(tmp_path) if ".journal.orphan-" in n]
+    assert len(orphans) == 1 and orphans[0] in errors[0]
+    with open(tmp_path / orphans[0], encoding="utf-8") as f:
+        assert "saat pull" in f.read()
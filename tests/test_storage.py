@@ -0,0 +1,126 @@
+"""TodoStore (xlsx dan SQLite): sheet tanpa header, export, batch, move_task."""
+import os
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from todocore import HEADER, SqliteTodoStore, XlsxTodoStore, copy_todos, file_hash
+
+
+@pytest.fixture(params=["xlsx", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "xlsx":
+        store = XlsxTodoStore(str(tmp_path / "todolist"))
+    else:
+        store = SqliteTodoStore(str(tmp_path / "todolist.db"))
+    store.create_todo("A")
+    yield store
+    store.close()
+
+
+def write_xlsx(path, rows, title="Default"):
+    """File todo buatan luar app (mis. Excel): rows apa adanya, termasuk header kalau ada."""
+    wb = Workbook()
+    wb.active.title = title
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+
+
+def test_sheet_without_header(tmp_path):
+    data_dir = tmp_path / "todolist"
+    data_dir.mkdir()
+    write_xlsx(str(data_dir / "Kosong.xlsx"), [])
+
+    store = XlsxTodoStore(str(data_dir))
+    key = store.add_task("Kosong", "Default", "pertama", tanggal="2025-09-01")
+    assert [tuple(t) for t in store.tasks("Kosong", "Default")] == [(key, "pertama", 0, "", "2025-09-01")]
+    store.close()
+
+    ws = load_workbook(store.path("Kosong"))["Default"]
+    assert [c.value for c in ws[1]] == HEADER
+    assert ws.max_row == 2
+    assert store.cached_progress("Kosong") == {"Default": [1, 0]}
+
+
+def test_export_does_not_touch_source(tmp_path):
+    data_dir = tmp_path / "todolist"
+    data_dir.mkdir()
+    path = str(data_dir / "Lama.xlsx")
+    write_xlsx(path, [HEADER[:4], ["lama", 0, "", "2025-09-01"]])  # file lama: belum ada kolom ID
+    before = file_hash(path)
+
+    store = XlsxTodoStore(str(data_dir))
+    (row,) = store.export_todo("Lama")["Default"]
+    store.close()
+    assert row[0] == "lama" and row[4]
+    assert file_hash(path) == before
+    assert store.written_paths() == []
+    assert not os.path.exists(path + ".journal")
+
+
+def test_exported_ids_match_ids_assigned_later(tmp_path):
+    data_dir = tmp_path / "todolist"
+    data_dir.mkdir()
+    write_xlsx(str(data_dir / "Lama.xlsx"), [HEADER[:4], ["satu", 0], ["dua", 1]])
+
+    store = XlsxTodoStore(str(data_dir))
+    sqlite = SqliteTodoStore(str(tmp_path / "todolist.db"))
+    first = store.export_todo("Lama")
+    assert store.export_todo("Lama") == first
+    copy_todos(store, sqlite)
+    assigned = [(t.task, t.key) for t in store.tasks("Lama", "Default")]  # xlsx baru diberi ID di sini
+    assert assigned == [(t.task, t.key) for t in sqlite.tasks("Lama", "Default")]
+    assert assigned == [(task, key) for task, _, _, _, key in first["Default"]]
+    store.close()
+    sqlite.close()
+
+
+def record(store, *events):
+    seen = []
+    for event in events:
+        store.events.subscribe(event, lambda event=event, **data: seen.append((event, data.get("todo"))))
+    return seen
+
+
+def test_batch_commit_emits_one_update(store):
+    seen = record(store, "todo_updated", "task_added", "task_toggled")
+    with store.batch("A") as b:
+        keys = [b.add_task("Default", f"t{i}", tanggal="2025-09-01") for i in range(20)]
+        for key in keys[::2]:
+            b.set_status("Default", key, 1)
+        assert len(b.tasks("Default")) == 20
+    assert seen == [("todo_updated", "A")]
+    assert store.cached_progress("A") == {"Default": [20, 10]}
+
+
+def test_batch_rollback_on_error(store):
+    keep = store.add_task("A", "Default", "keep")
+    with pytest.raises(RuntimeError):
+        with store.batch("A") as b:
+            b.add_task("Default", "gone")
+            b.set_status("Default", keep, 1)
+            b.rename_section("Default", "Baru")
+            raise RuntimeError("boom")
+    assert store.sections("A") == ["Default"]
+    assert [(t.task, t.status) for t in store.tasks("A", "Default")] == [("keep", 0)]
+    assert store.months("A", "Default") == []
+
+
+def test_batch_rollback_keeps_earlier_changes(store):
+    store.add_task("A", "Default", "sebelum")
+    b = store.batch("A")
+    b.delete_task("Default", store.tasks("A", "Default")[0].key)
+    b.rollback()
+    assert [t.task for t in store.tasks("A", "Default")] == ["sebelum"]
+    with pytest.raises(RuntimeError):
+        b.commit()
+
+
+def test_move_task_keeps_id(store):
+    store.add_section("A", "Lain")
+    key = store.add_task("A", "Default", "pindah", note="n", tanggal="2025-09-01", status=1)
+    with store.batch("A") as b:
+        b.move_task("Default", key, "Lain")
+    assert store.tasks("A", "Default") == []
+    assert [tuple(t) for t in store.tasks("A", "Lain")] == [(key, "pindah", 1, "n", "2025-09-01")]
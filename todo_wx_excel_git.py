@@ -1,153 +1,89 @@
 
+import time
+
+_T0 = time.perf_counter()  # awal --profile-startup, sebelum wx & todocore dimuat
+
 import wx
-import wx.adv
 import os
-import openpyxl
 import datetime
-import subprocess
-from openpyxl import Workbook
+import threading
+import argparse
+import functools
+
+from todocore import (
+    GIT,
+    GIT_STAGE_ALL,
+    STORE_BACKEND,
+    GitJob,
+    GitStatusPoller,
+    GitWatcher,
+    ensure_data_dir,
+    find_repo_root,
+    git_file_state,
+    git_pull,
+    git_push,
+    migrate,
+    open_store,
+    progress_percent,
+    sheet_title_error,
+)
 
 # ===== Config & Colors =====
-DATA_DIR = os.path.join("data", "todolist")
-HEADER = ["Task", "Status", "Note", "Tanggal"]  # Status: 0 = aktif, 1 = selesai
+GIT_POLL_MS = 4000  # interval poll git status kalau GitWatcher tidak tersedia
+GIT_BADGES = {"modified": "diubah", "untracked": "baru", "conflict": "KONFLIK"}  # badge sidebar per file
+VIRTUAL_LIST_MIN = 200  # section dengan task sebanyak ini ditampilkan lewat TaskListView
+ROW_POOL_MAX = 200  # panel baris task nganggur yang disimpan untuk dipakai ulang
+STARTUP_DEFER_MS = 200  # jeda setelah jendela tampil sebelum git status & scan progress pertama
 
 YELLOW = wx.Colour(255, 255, 102)
 GREY_DONE = wx.Colour(136, 136, 136)
 GREY_NOTE = wx.Colour(180, 180, 180)
 BG_DARK = wx.Colour(30, 30, 30)
 BG_PANEL = wx.Colour(40, 40, 40)
+BG_SELECTED = wx.Colour(60, 60, 60)
 FG_TEXT = wx.Colour(230, 230, 230)
 
 
-# ===== Git Helpers =====
-def _run_git(args, repo_dir):
-    try:
-        return subprocess.run(
-            ["git"] + args,
-            cwd=repo_dir,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-    except Exception as e:
-        return None
+# ===== UI Helpers =====
+def parse_display_to_name(display_text: str) -> str:
+    if " (" in display_text and display_text.endswith(")"):
+        return display_text.rsplit(" (", 1)[0]
+    return display_text
 
 
-def find_repo_root(start_path=None):
+class StartupProfile:
     """
-    Cari root repo git dengan mencari folder .git ke atas.
-    Jika tidak ketemu, kembalikan None.
+    Catat kapan tiap fase startup selesai (--profile-startup). Fase yang sama
+    hanya dicatat pertama kali; ringkasan dicetak sekali, begitu semua fase di
+    `wait` (yang berjalan di background) selesai. mark() aman dari thread lain.
     """
-    if start_path is None:
-        try:
-            # lokasi file skrip
-            start_path = os.path.dirname(os.path.abspath(__file__))
-        except NameError:
-            # fallback: current working dir
-            start_path = os.getcwd()
-
-    path = os.path.abspath(start_path)
-    while True:
-        if os.path.isdir(os.path.join(path, ".git")):
-            return path
-        parent = os.path.dirname(path)
-        if parent == path:
-            return None
-        path = parent
-
-
-def git_is_repo(repo_dir=None):
-    return find_repo_root(repo_dir) is not None
-
-
-def git_status(repo_dir=None):
-    root = find_repo_root(repo_dir)
-    if root is None:
-        return None  # bukan repo git
-    res = _run_git(["status", "--porcelain"], root)
-    if res is None or res.returncode != 0:
-        return None
-    return res.stdout.strip()  # string kosong berarti bersih
-
-
-def git_pull(repo_dir=None):
-    root = find_repo_root(repo_dir)
-    if root is None:
-        return (1, "Bukan repository git.")
-    res = _run_git(["pull", "--rebase"], root)
-    if res is None:
-        return (1, "Gagal menjalankan git.")
-    return (res.returncode, res.stdout or res.stderr)
-
-
-def git_push(repo_dir=None, auto_commit=True):
-    root = find_repo_root(repo_dir)
-    if root is None:
-        return (1, "Bukan repository git.")
-
-    if auto_commit:
-        # add .
-        res_add = _run_git(["add", "."], root)
-        if res_add is None or res_add.returncode != 0:
-            return (1, (res_add.stderr if res_add else "Gagal git add."))
-
-        # commit hanya jika ada perubahan staged
-        res_diff = _run_git(["diff", "--cached", "--name-only"], root)
-        if res_diff and res_diff.stdout.strip():
-            msg = f"sync update {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-            res_commit = _run_git(["commit", "-m", msg], root)
-            # jika tidak ada perubahan, git commit akan returncode=1 dengan pesan "nothing to commit"
-            # itu tidak fatal, lanjut ke push
-        # else: tidak ada yang di-commit
-
-    res_push = _run_git(["push"], root)
-    if res_push is None:
-        return (1, "Gagal menjalankan git push.")
-    return (res_push.returncode, res_push.stdout or res_push.stderr)
-
-
-# ===== Helpers =====
-def ensure_data_dir():
-    os.makedirs(DATA_DIR, exist_ok=True)
-
-
-def create_new_todo_excel(path, first_sheet_name="Default"):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = first_sheet_name
-    ws.append(HEADER)
-    wb.save(path)
-
-
-def safe_unpack(row):
-    values = list(row)
-    if len(values) < 4:
-        values += [""] * (4 - len(values))
-    return values[:4]
-
-
-def calc_todo_progress(path) -> int:
-    try:
-        wb = openpyxl.load_workbook(path)
-    except Exception:
-        return 0
-    total, done = 0, 0
-    for ws in wb.worksheets:
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            task, status, note, tanggal = safe_unpack(row)
-            if task and str(task).strip() != "":
-                total += 1
-                if status in (1, "1", True):
-                    done += 1
-    if total == 0:
-        return 0
-    return int((done / total) * 100)
-
 
-def parse_display_to_name(display_text: str) -> str:
-    if " (" in display_text and display_text.endswith(")"):
-        return display_text.rsplit(" (", 1)[0]
-    return display_text
+    def __init__(self, t0, enabled=False, wait=()):
+        self.t0 = t0
+        self.enabled = enabled
+        self.wait = set(wait)
+        self.phases = []
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        with self._lock:
+            if any(p == phase for p, _ in self.phases):
+                return
+            self.phases.append((phase, time.perf_counter() - self.t0))
+            self.wait.discard(phase)
+            if self.wait:
+                return
+            self.enabled = False
+        self.report()
+
+    def report(self):
+        print(f"{'fase startup':<24} {'durasi':>8} {'total':>8}")
+        prev = 0.0
+        for phase, at in self.phases:
+            print(f"{phase:<24} {(at - prev) * 1000:>6.1f}ms {at * 1000:>6.1f}ms")
+            prev = at
 
 
 # ===== Dialogs =====
@@ -169,8 +105,10 @@ class ItemDialog(wx.Dialog):
 
         t3 = wx.StaticText(pnl, label="Tanggal")
         t3.SetForegroundColour(FG_TEXT)
-        self.date_picker = wx.adv.DatePickerCtrl(
-            pnl, style=wx.adv.DP_DROPDOWN | wx.adv.DP_SHOWCENTURY
+        from wx import adv  # wx.adv baru dimuat saat dialog pertama dibuka
+
+        self.date_picker = adv.DatePickerCtrl(
+            pnl, style=adv.DP_DROPDOWN | adv.DP_SHOWCENTURY
         )
 
         # default
@@ -242,12 +180,190 @@ class RenameTodoDialog(wx.Dialog):
     def get_value(self): return self.txt.GetValue().strip()
 
 
+class DateDialog(wx.Dialog):
+    def __init__(self, parent, title="Tanggal"):
+        super().__init__(parent, title=title, size=(360, 160))
+        pnl = wx.Panel(self); pnl.SetBackgroundColour(BG_DARK)
+        v = wx.BoxSizer(wx.VERTICAL)
+        t1 = wx.StaticText(pnl, label="Tanggal Baru"); t1.SetForegroundColour(FG_TEXT)
+        from wx import adv
+        self.date_picker = adv.DatePickerCtrl(pnl, style=adv.DP_DROPDOWN | adv.DP_SHOWCENTURY)  # default hari ini
+        btns = wx.StdDialogButtonSizer()
+        ok_btn = wx.Button(pnl, wx.ID_OK); cancel_btn = wx.Button(pnl, wx.ID_CANCEL)
+        btns.AddButton(ok_btn); btns.AddButton(cancel_btn); btns.Realize()
+        v.Add(t1, 0, wx.ALL, 10); v.Add(self.date_picker, 0, wx.EXPAND | wx.ALL, 10); v.Add(btns, 0, wx.EXPAND | wx.ALL, 10)
+        pnl.SetSizer(v); self.Centre()
+    def get_value(self):
+        d = self.date_picker.GetValue()
+        return f"{d.GetYear()}-{d.GetMonth()+1:02d}-{d.GetDay():02d}"
+
+
+# ===== Task List (virtual) =====
+class TaskListView(wx.VListBox):
+    """
+    Daftar task owner-drawn: hanya baris yang terlihat yang digambar, tanpa
+    widget per task, jadi memori tetap datar berapa pun panjang section.
+    Checkbox, tombol Edit dan Hapus digambar sendiri dan di-hit-test saat klik.
+    Klik di luarnya memilih task (Ctrl/Shift untuk banyak, diurus VListBox).
+    """
+
+    PAD = 6
+    BTN_W, BTN_H = 72, 26
+
+    def __init__(self, parent, on_toggle, on_edit, on_delete):
+        super().__init__(parent, style=wx.LB_MULTIPLE)
+        self.SetBackgroundColour(BG_DARK)
+        self.on_toggle, self.on_edit, self.on_delete = on_toggle, on_edit, on_delete
+        self.tasks = []
+        self._line_h = self.GetCharHeight()
+        self.Bind(wx.EVT_LEFT_DOWN, self._on_left_down)
+        self.Bind(wx.EVT_LISTBOX_DCLICK, lambda e: self._call(self.on_edit, e.GetSelection()))
+        self.Bind(wx.EVT_KEY_DOWN, self._on_key)
+
+    def set_tasks(self, tasks):
+        self.tasks = list(tasks)
+        self.SetItemCount(len(self.tasks))
+        self.DeselectAll()
+        self.Refresh()
+
+    def keys(self):
+        return [t.key for t in self.tasks]
+
+    def selected_keys(self):
+        return [t.key for n, t in enumerate(self.tasks) if self.IsSelected(n)]
+
+    def select_keys(self, keys):
+        self.DeselectAll()
+        for n, t in enumerate(self.tasks):
+            if t.key in keys:
+                self.Select(n)
+
+    def _position(self, key):
+        for n, t in enumerate(self.tasks):
+            if t.key == key:
+                return n
+        return None
+
+    def put_task(self, t):
+        """Perbarui satu task (atau tambahkan di akhir) tanpa menggambar ulang semuanya."""
+        n = self._position(t.key)
+        if n is None:
+            self.tasks.append(t)
+            self.SetItemCount(len(self.tasks))
+            self.RefreshRow(len(self.tasks) - 1)
+        else:
+            self.tasks[n] = t
+            self.RefreshRow(n)
+
+    def remove_task(self, key):
+        n = self._position(key)
+        if n is not None:
+            selected = set(self.selected_keys())  # seleksi VListBox per nomor baris: ikut digeser
+            del self.tasks[n]
+            self.SetItemCount(len(self.tasks))
+            self.select_keys(selected - {key})
+            self.RefreshRows(n, len(self.tasks))
+
+    def _call(self, fn, n):
+        if 0 <= n < len(self.tasks):
+            t = self.tasks[n]
+            if fn is self.on_toggle:
+                fn(t.key, not t.status)
+            else:
+                fn(t.key)
+
+    # --- geometry
+    def _checkbox_rect(self, rect):
+        size = wx.RendererNative.Get().GetCheckBoxSize(self)
+        top = rect.y + self.PAD + (self.BTN_H - size.height) // 2
+        return wx.Rect(rect.x + self.PAD * 2, top, size.width, size.height)
+
+    def _button_rects(self, rect):
+        top = rect.y + self.PAD
+        delete = wx.Rect(rect.GetRight() - self.PAD - self.BTN_W, top, self.BTN_W, self.BTN_H)
+        edit = wx.Rect(delete.x - self.PAD - self.BTN_W, top, self.BTN_W, self.BTN_H)
+        return edit, delete
+
+    # --- wx.VListBox
+    def OnMeasureItem(self, n):
+        h = self.BTN_H + self.PAD * 2
+        if self.tasks[n].note:
+            h += self._line_h + self.PAD
+        return h + self.PAD  # jarak antar baris
+
+    def OnDrawBackground(self, dc, rect, n):
+        dc.SetPen(wx.TRANSPARENT_PEN)
+        dc.SetBrush(wx.Brush(BG_DARK))
+        dc.DrawRectangle(rect)
+        dc.SetBrush(wx.Brush(BG_SELECTED if self.IsSelected(n) else BG_PANEL))
+        dc.DrawRectangle(rect.x, rect.y, rect.width, rect.height - self.PAD)
+
+    def OnDrawItem(self, dc, rect, n):
+        t = self.tasks[n]
+        renderer = wx.RendererNative.Get()
+        cb = self._checkbox_rect(rect)
+        renderer.DrawCheckBox(self, dc, cb, wx.CONTROL_CHECKED if t.status else 0)
+        edit, delete = self._button_rects(rect)
+        dc.SetFont(self.GetFont())
+        text_x = cb.GetRight() + self.PAD
+        dc.SetClippingRegion(text_x, rect.y, max(0, edit.x - self.PAD - text_x), rect.height)
+        dc.SetTextForeground(GREY_DONE if t.status else YELLOW)
+        dc.DrawText(f"{t.task} [{t.tanggal}]", text_x, rect.y + self.PAD + (self.BTN_H - self._line_h) // 2)
+        if t.note:
+            dc.SetTextForeground(GREY_NOTE)
+            dc.DrawText(str(t.note).splitlines()[0], rect.x + self.PAD * 2, rect.y + self.PAD * 2 + self.BTN_H)
+        dc.DestroyClippingRegion()
+        for label, r in (("Edit", edit), ("Hapus", delete)):
+            renderer.DrawPushButton(self, dc, r)
+            dc.SetTextForeground(wx.SystemSettings.GetColour(wx.SYS_COLOUR_BTNTEXT))
+            dc.DrawLabel(label, r, wx.ALIGN_CENTER)
+
+    # --- input
+    def _on_left_down(self, e):
+        n = self.VirtualHitTest(e.GetY())
+        if n == wx.NOT_FOUND:
+            e.Skip()
+            return
+        rect = self.GetItemRect(n)
+        edit, delete = self._button_rects(rect)
+        pos = e.GetPosition()
+        if self._checkbox_rect(rect).Inflate(self.PAD, self.PAD).Contains(pos):
+            self._call(self.on_toggle, n)
+        elif edit.Contains(pos):
+            self._call(self.on_edit, n)
+        elif delete.Contains(pos):
+            self._call(self.on_delete, n)
+        else:
+            e.Skip()  # biarkan VListBox mengurus seleksi
+
+    def _on_key(self, e):
+        n = self.GetCurrent()  # GetSelection tidak boleh dipakai di mode LB_MULTIPLE
+        if e.GetKeyCode() == wx.WXK_SPACE:
+            self._call(self.on_toggle, n)
+        elif e.GetKeyCode() == wx.WXK_DELETE:
+            self._call(self.on_delete, n)
+        elif e.GetKeyCode() in (wx.WXK_RETURN, wx.WXK_NUMPAD_ENTER):
+            self._call(self.on_edit, n)
+        else:
+            e.Skip()
+
+
 # ===== Main App =====
 class TodoApp(wx.Frame):
-    def __init__(self):
+    def __init__(self, store=None, row_pool_max=ROW_POOL_MAX, stage_all=GIT_STAGE_ALL, profile=None):
         super().__init__(None, title="Excel Todo Manager", size=(1150, 720))
         ensure_data_dir(); self.SetBackgroundColour(BG_DARK)
-        self.file_map = {}; self.current_file=None; self.current_name=""; self.current_sheet=None
+        self.store = store or open_store(); self.current_name=""; self.current_sheet=None; self.task_rows={}; self.row_pool=[]; self.row_pool_max=row_pool_max; self.stage_all=stage_all
+        self.selected=set(); self.select_anchor=None  # task terpilih di area panel (TaskListView menyimpan seleksinya sendiri)
+        self.profile=profile or StartupProfile(_T0)
+        self.git_states={}; self.todo_pct={}  # badge & progress sidebar, dirender lewat todo_display
+        # data layer -> UI lewat EventBus; event bisa datang dari thread lain, jadi selalu lewat wx.CallAfter
+        ui=lambda handler:(lambda **data:wx.CallAfter(handler,**data)); events=self.store.events
+        events.subscribe("progress",ui(self.on_todo_progress)); events.subscribe("save_state",ui(self.show_save_state))
+        for ev in ("task_added","task_edited","task_toggled","task_deleted"): events.subscribe(ev,ui(functools.partial(self.on_task_event,ev)))
+        for ev in ("section_added","section_renamed","section_deleted"): events.subscribe(ev,ui(self.on_section_event))
+        for ev in ("todo_created","todo_renamed","todo_deleted","todo_imported"): events.subscribe(ev,ui(functools.partial(self.on_todo_event,ev)))
+        events.subscribe("todo_updated",ui(self.on_todo_updated))
 
         root = wx.BoxSizer(wx.HORIZONTAL)
 
@@ -257,7 +373,7 @@ class TodoApp(wx.Frame):
         lbl = wx.StaticText(side_panel, label="Daftar Todo"); lbl.SetForegroundColour(FG_TEXT); f=lbl.GetFont(); f.MakeBold(); lbl.SetFont(f)
         self.todo_list = wx.ListBox(side_panel, size=(300,-1)); self.todo_list.Bind(wx.EVT_LISTBOX, self.on_select_todo)
         self.todo_list.SetBackgroundColour(BG_DARK); self.todo_list.SetForegroundColour(FG_TEXT)
-        btn_new=wx.Button(side_panel,label="Buat Todo Baru"); btn_ren=wx.Button(side_panel,label="Rename Todo"); btn_del=wx.Button(side_panel,label="Hapus Todo"); btn_ref=wx.Button(side_panel,label="Refresh")
+        btn_new=wx.Button(side_panel,label="Buat Todo Baru"); self.btn_ren_todo=btn_ren=wx.Button(side_panel,label="Rename Todo"); self.btn_del_todo=btn_del=wx.Button(side_panel,label="Hapus Todo"); btn_ref=wx.Button(side_panel,label="Refresh")
         for b in (btn_new,btn_ren,btn_del,btn_ref): b.SetBackgroundColour(wx.Colour(0,122,204)); b.SetForegroundColour(wx.WHITE)
         btn_new.Bind(wx.EVT_BUTTON,self.create_todo); btn_ren.Bind(wx.EVT_BUTTON,self.rename_todo); btn_del.Bind(wx.EVT_BUTTON,self.delete_todo); btn_ref.Bind(wx.EVT_BUTTON,lambda e:self.load_todo_files(preserve=self.current_name))
         side_sizer.Add(lbl,0,wx.ALL,8); side_sizer.Add(self.todo_list,1,wx.EXPAND|wx.ALL,8)
@@ -286,10 +402,13 @@ class TodoApp(wx.Frame):
         self.git_text = wx.StaticText(main_panel, label="GIT")
         self.git_text.SetForegroundColour(FG_TEXT)
 
-        btn_pull = wx.Button(main_panel, label="Pull")
-        btn_push = wx.Button(main_panel, label="Push")
+        self.btn_pull = btn_pull = wx.Button(main_panel, label="Pull")
+        self.btn_push = btn_push = wx.Button(main_panel, label="Push")
         btn_pull.Bind(wx.EVT_BUTTON, lambda e: self.do_git_pull())
         btn_push.Bind(wx.EVT_BUTTON, lambda e: self.do_git_push())
+        self.save_text = wx.StaticText(main_panel, label="Tersimpan")
+        self.save_text.SetForegroundColour(GREY_NOTE)
+        bar.Add(self.save_text, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 12)
         bar.Add(self.git_text, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 4)
         bar.Add(self.git_indicator, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 8)
         bar.Add(btn_pull, 0, wx.RIGHT, 4)
@@ -297,32 +416,99 @@ class TodoApp(wx.Frame):
 
         main_sizer.Add(bar,0,wx.ALL|wx.EXPAND,10)
 
+        task_bar=wx.BoxSizer(wx.HORIZONTAL)
         btn_add_item=wx.Button(main_panel,label="Tambah Task"); btn_add_item.SetBackgroundColour(wx.Colour(0,122,204)); btn_add_item.SetForegroundColour(wx.WHITE); btn_add_item.Bind(wx.EVT_BUTTON,self.add_item)
-        main_sizer.Add(btn_add_item,0,wx.LEFT|wx.RIGHT|wx.BOTTOM,10)
+        task_bar.Add(btn_add_item,0,wx.RIGHT,12)
+        # aksi untuk banyak task terpilih (klik baris, Ctrl/Shift-klik, atau Pilih Semua)
+        btn_sel_all=wx.Button(main_panel,label="Pilih Semua"); btn_sel_none=wx.Button(main_panel,label="Batal Pilih")
+        btn_sel_all.Bind(wx.EVT_BUTTON,lambda e:self.select_all_tasks()); btn_sel_none.Bind(wx.EVT_BUTTON,lambda e:self.select_tasks(()))
+        for b in (btn_sel_all,btn_sel_none): task_bar.Add(b,0,wx.RIGHT,6)
+        self.sel_text=wx.StaticText(main_panel,label=""); self.sel_text.SetForegroundColour(GREY_NOTE); task_bar.Add(self.sel_text,0,wx.ALIGN_CENTER_VERTICAL|wx.LEFT|wx.RIGHT,6)
+        self.bulk_buttons=[]
+        for label,handler in (("Tandai Selesai",lambda e:self.bulk_set_status(1)),("Tandai Aktif",lambda e:self.bulk_set_status(0)),("Pindah Section",self.bulk_move),("Ubah Tanggal",self.bulk_change_date),("Hapus Terpilih",self.bulk_delete)):
+            b=wx.Button(main_panel,label=label); b.SetBackgroundColour(wx.Colour(85,85,85)); b.SetForegroundColour(wx.WHITE); b.Bind(wx.EVT_BUTTON,handler); b.Disable(); task_bar.Add(b,0,wx.RIGHT,6); self.bulk_buttons.append(b)
+        main_sizer.Add(task_bar,0,wx.LEFT|wx.RIGHT|wx.BOTTOM,10)
 
         self.scroll=wx.ScrolledWindow(main_panel,style=wx.VSCROLL); self.scroll.SetScrollRate(0,14); self.scroll.SetBackgroundColour(BG_DARK)
         self.task_area=wx.Panel(self.scroll); self.task_area.SetBackgroundColour(BG_DARK); self.task_sizer=wx.BoxSizer(wx.VERTICAL); self.task_area.SetSizer(self.task_sizer)
         sv=wx.BoxSizer(wx.VERTICAL); sv.Add(self.task_area,1,wx.EXPAND|wx.ALL,6); self.scroll.SetSizer(sv); main_sizer.Add(self.scroll,1,wx.EXPAND|wx.ALL,10)
+        # section besar: daftar virtual, bukan satu panel per task
+        self.task_list=TaskListView(main_panel,on_toggle=self.toggle_task,on_edit=self.edit_item,on_delete=self.delete_item); self.task_list.Hide(); main_sizer.Add(self.task_list,1,wx.EXPAND|wx.ALL,10)
+        self.task_list.Bind(wx.EVT_LISTBOX,lambda e:self.update_bulk_bar())
+
+        # === Panel progress git pull/push (jalan di background) ===
+        self.git_job = None
+        self.git_panel = wx.Panel(main_panel)
+        self.git_panel.SetBackgroundColour(BG_PANEL)
+        git_sizer = wx.BoxSizer(wx.VERTICAL)
+        git_top = wx.BoxSizer(wx.HORIZONTAL)
+        self.git_progress = wx.StaticText(self.git_panel, label="")
+        self.git_progress.SetForegroundColour(FG_TEXT)
+        self.btn_git_cancel = wx.Button(self.git_panel, label="Batal")
+        self.btn_git_cancel.Bind(wx.EVT_BUTTON, self.on_git_cancel)
+        git_top.Add(self.git_progress, 1, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 6)
+        git_top.Add(self.btn_git_cancel, 0, wx.ALL, 6)
+        self.git_log = wx.TextCtrl(self.git_panel, style=wx.TE_MULTILINE | wx.TE_READONLY, size=(-1, 110))
+        self.git_log.SetBackgroundColour(BG_DARK)
+        self.git_log.SetForegroundColour(GREY_NOTE)
+        git_sizer.Add(git_top, 0, wx.EXPAND)
+        git_sizer.Add(self.git_log, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 6)
+        self.git_panel.SetSizer(git_sizer)
+        self.git_panel.Hide()
+        main_sizer.Add(self.git_panel, 0, wx.EXPAND | wx.LEFT | wx.RIGHT | wx.BOTTOM, 10)
 
         main_panel.SetSizer(main_sizer); root.Add(main_panel,1,wx.EXPAND)
-        self.SetSizer(root); self.Centre(); self.load_todo_files(); self.Show()
 
-        # Timer untuk update git status
+        # Git status dijalankan di thread GitStatusPoller, dipicu GitWatcher
+        # saat ada perubahan file; timer hanya cadangan kalau watcher tidak jalan
+        self.git_poller = GitStatusPoller(lambda status: wx.CallAfter(self.show_git_status, status))
+        self.git_watcher = None  # dibuat di start_background
         self.timer = wx.Timer(self)
         self.Bind(wx.EVT_TIMER, lambda e: self.update_git_status(), self.timer)
-        self.timer.Start(4000)  # cek tiap 4 detik
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+        # jendela tampil dulu; sidebar diisi di tick berikutnya, git & scan progress menyusul
+        self.SetSizer(root); self.Centre(); self.profile.mark("bangun frame"); self.Show(); self.profile.mark("Show()")
+        wx.CallAfter(self.populate)
+        self.startup_call = wx.CallLater(STARTUP_DEFER_MS, self.start_background)
+
+    # === Startup ===
+    def populate(self):
+        if not self:
+            return
+        self.profile.mark("tick pertama")
+        self.load_todo_files(scan=False)
+        self.profile.mark("sidebar dari cache")
+
+    def start_background(self):
+        """Kerja startup yang tidak perlu ditunggu jendela: watcher/poll git dan scan progress."""
+        if not self:
+            return
+        root = find_repo_root()
+        self.git_watcher = GitWatcher(root or os.getcwd(), self.git_poller.request)
+        if root is None or not self.git_watcher.start():
+            self.timer.Start(GIT_POLL_MS)
         self.update_git_status()
+        self.scan_progress([n for n in self.store.list_todos() if self.store.cached_progress(n) is None])
 
     # === Git related ===
     def update_git_status(self):
-        status = git_status(None)
+        self.git_poller.request()
+
+    def show_git_status(self, status):
+        if not self:
+            return  # frame sudah ditutup saat poll selesai
+        self.profile.mark("git status pertama")
+        if (status or {}) != self.git_states:
+            self.git_states = status or {}
+            self.refresh_todo_labels()
         if status is None:
             # bukan repo git atau error
             self.git_indicator.SetLabel("✖")
             self.git_indicator.SetForegroundColour(wx.Colour(200, 0, 0))  # merah
             self.git_indicator.SetToolTip("Bukan repo Git atau error.")
             self.git_text.SetLabel("GIT: N/A")
-        elif status == "":
+        elif not status:
             # bersih
             self.git_indicator.SetLabel("●")
             self.git_indicator.SetForegroundColour(wx.BLUE)  # biru
@@ -334,29 +520,138 @@ class TodoApp(wx.Frame):
             self.git_indicator.SetForegroundColour(wx.RED)  # merah
             self.git_indicator.SetToolTip("Ada perubahan lokal yang belum di-commit/push.")
             self.git_text.SetLabel("GIT: Dirty")
+        latency = GIT.last_latency("status")
+        if latency is not None:
+            self.git_text.SetToolTip(f"git status: {latency * 1000:.0f} ms")
 
     def do_git_pull(self):
-        code, out = git_pull(None)
-        self.update_git_status()
-        wx.MessageBox(out or "Selesai.", "Git Pull" if code == 0 else "Git Pull (error)")
+        self.start_git_job("Git Pull", lambda run: git_pull(None, run=run))
 
     def do_git_push(self):
-        code, out = git_push(None, auto_commit=True)
+        def push(run):
+            # hanya file yang ditulis app (kecuali stage_all); daftar dikosongkan setelah push sukses
+            paths = None if self.stage_all else self.store.written_paths()
+            code, out = git_push(None, auto_commit=True, run=run, paths=paths)
+            if code == 0 and paths:
+                self.store.forget_written(paths)
+            return code, out
+
+        self.start_git_job("Git Push", push)
+
+    def start_git_job(self, title, git_call):
+        """Jalankan git_call(run) di GitJob; selama itu store tidak menulis file apa pun."""
+        if self.git_job and self.git_job.is_running():
+            return
+
+        def target(run):
+            # di thread GitJob: semua perubahan ke disk dulu, lalu tahan simpan sampai git selesai
+            if not self.store.flush():
+                return 1, f"Ada perubahan yang gagal disimpan, dibatalkan.\n{self.store.last_error}"
+            self.store.hold_saves()
+            try:
+                return git_call(run)
+            finally:
+                self.store.release_saves()
+
+        self.btn_pull.Disable()
+        self.btn_push.Disable()
+        # rename/hapus todo menunggu semua simpan selesai, padahal simpan ditahan selama git jalan
+        self.btn_ren_todo.Disable()
+        self.btn_del_todo.Disable()
+        self.git_log.Clear()
+        self.git_progress.SetLabel(f"{title}…")
+        self.btn_git_cancel.SetLabel("Batal")
+        self.git_panel.Show()
+        self.git_panel.GetParent().Layout()
+        self.git_job = GitJob(
+            target,
+            on_output=lambda text, transient: wx.CallAfter(self.on_git_output, text, transient),
+            on_done=lambda code, out: wx.CallAfter(self.on_git_done, title, code, out),
+        )
+        self.git_job.start()
+
+    def on_git_output(self, text, transient):
+        if not self:
+            return
+        self.git_progress.SetLabel(text.strip())
+        if not transient:
+            self.git_log.AppendText(text.rstrip() + "\n")
+
+    def on_git_done(self, title, code, out):
+        if not self:
+            return
+        self.btn_pull.Enable()
+        self.btn_push.Enable()
+        self.btn_ren_todo.Enable()
+        self.btn_del_todo.Enable()
+        self.btn_git_cancel.SetLabel("Tutup")
+        self.git_progress.SetLabel(f"{title}: selesai" if code == 0 else f"{title}: gagal")
+        if out and out.strip() not in self.git_log.GetValue():
+            self.git_log.AppendText(out.strip() + "\n")
         self.update_git_status()
-        wx.MessageBox(out or "Selesai.", "Git Push" if code == 0 else "Git Push (error)")
+
+    def on_git_cancel(self, e):
+        if self.git_job and self.git_job.is_running():
+            self.git_progress.SetLabel("Membatalkan…")
+            self.git_job.cancel()
+        else:
+            self.git_panel.Hide()
+            self.git_panel.GetParent().Layout()
 
     # === CRUD Todo (file)
-    def load_todo_files(self,preserve=None):
-        self.file_map.clear(); displays=[]
-        os.makedirs(DATA_DIR, exist_ok=True)
-        for f in sorted(os.listdir(DATA_DIR)):
-            if f.lower().endswith(".xlsx"):
-                name=os.path.splitext(f)[0]; path=os.path.join(DATA_DIR,f); self.file_map[name]=path
-                pct=calc_todo_progress(path); displays.append(f"{name} ({pct}%)")
+    def load_todo_files(self,preserve=None,scan=True):
+        """Daftar todo langsung tampil; progress yang belum diketahui diisi worker di background (kecuali scan=False)."""
+        displays=[]; pending=[]; self.todo_pct={}
+        for name in self.store.list_todos():
+            sections=self.store.cached_progress(name)
+            if sections is None: pending.append(name)
+            else: self.todo_pct[name]=progress_percent(sections)
+            displays.append(self.todo_display(name))
         self.todo_list.Set(displays)
-        if preserve:
-            for i,txt in enumerate(self.todo_list.GetStrings()):
-                if parse_display_to_name(txt)==preserve: self.todo_list.SetSelection(i); break
+        if preserve: self.select_todo_name(preserve)
+        if scan: self.scan_progress(pending)
+    def scan_progress(self,names):
+        # jalan di thread lain: jangan sentuh widget, hasil masuk lewat event "progress"
+        def run(): self.store.scan_progress(names); self.profile.mark("scan progress")
+        if names: threading.Thread(target=run,daemon=True).start()
+        else: self.profile.mark("scan progress")
+    def on_todo_updated(self,todo):
+        """Batch di-commit: todo yang sedang dibuka dibangun ulang sekali (section + task)."""
+        if self and todo==self.current_name: self.load_sheets()
+    def on_todo_progress(self,todo,sections):
+        if self: self.set_todo_label(todo,progress_percent(sections))  # frame mungkin sudah ditutup
+    def on_todo_event(self,event,todo,new=None):
+        """Daftar todo berubah (buat/rename/hapus/impor): hanya sidebar dan todo yang sedang dibuka."""
+        if not self: return
+        selected=self.get_selected_todo_name()
+        if event=="todo_created": selected=todo
+        elif event=="todo_renamed":
+            if selected==todo: selected=new
+            if self.current_name==todo: self.current_name=new; self.lbl_title.SetLabel(f"# {new}")
+        elif event=="todo_deleted" and self.current_name==todo:
+            self.current_name=""; self.current_sheet=None; self.lbl_title.SetLabel("(Belum memilih Todo)"); self.sheet_list.Set([]); self.clear_tasks()
+        self.load_todo_files(preserve=selected)
+        if event=="todo_imported" and self.current_name==todo: self.load_sheets()
+    def todo_display(self,name):
+        """'nama (40%)', '(…)' selama progress belum ada, plus badge git kalau filenya berubah."""
+        pct=self.todo_pct.get(name); badge=GIT_BADGES.get(git_file_state(self.git_states,self.store.todo_file(name)))
+        return f"{name} ({'…' if pct is None else f'{pct}%'}{', '+badge if badge else ''})"
+    def set_todo_label(self,name,pct):
+        self.todo_pct[name]=pct; self.refresh_todo_labels(name)
+    def refresh_todo_labels(self,only=None):
+        sel=self.todo_list.GetSelection()
+        for i,txt in enumerate(self.todo_list.GetStrings()):
+            name=parse_display_to_name(txt)
+            if only and name!=only: continue
+            display=self.todo_display(name)
+            if display!=txt:
+                self.todo_list.SetString(i,display)
+                if sel==i: self.todo_list.SetSelection(i)  # beberapa platform melepas seleksi saat SetString
+            if only: break
+    def select_todo_name(self,name):
+        for i,txt in enumerate(self.todo_list.GetStrings()):
+            if parse_display_to_name(txt)==name: self.todo_list.SetSelection(i); return True
+        return False
     def get_selected_todo_name(self):
         sel=self.todo_list.GetSelection(); 
         if sel==wx.NOT_FOUND: return None
@@ -366,9 +661,8 @@ class TodoApp(wx.Frame):
         if dlg.ShowModal()==wx.ID_OK:
             name=dlg.get_value(); 
             if not name: return
-            path=os.path.join(DATA_DIR,f"{name}.xlsx"); 
-            if os.path.exists(path): wx.MessageBox("Nama sudah ada","Error"); return
-            create_new_todo_excel(path); self.load_todo_files(preserve=name)
+            if self.store.exists(name): wx.MessageBox("Nama sudah ada","Error"); return
+            self.store.create_todo(name)
         dlg.Destroy()
     def rename_todo(self,e):
         name=self.get_selected_todo_name(); 
@@ -377,121 +671,252 @@ class TodoApp(wx.Frame):
         if dlg.ShowModal()==wx.ID_OK:
             new_name=dlg.get_value(); 
             if not new_name: return
-            old_path=self.file_map[name]; new_path=os.path.join(DATA_DIR,f"{new_name}.xlsx"); os.rename(old_path,new_path)
-            if self.current_file==old_path: self.current_file=new_path; self.current_name=new_name; self.lbl_title.SetLabel(f"# {new_name}")
-            self.load_todo_files(preserve=new_name)
+            if self.store.exists(new_name): wx.MessageBox("Nama sudah ada","Error"); return
+            busy=wx.BusyCursor()
+            try: self.store.rename_todo(name,new_name)
+            except OSError as ex: del busy; wx.MessageBox(str(ex),"Error"); return
+            del busy
         dlg.Destroy()
     def delete_todo(self,e):
         name=self.get_selected_todo_name(); 
         if not name: return
-        path=self.file_map[name]; 
         if wx.MessageBox(f"Hapus todo '{name}'?","Konfirmasi",wx.YES_NO)==wx.YES:
-            os.remove(path); 
-            if self.current_name==name: self.current_file=None; self.current_sheet=None; self.lbl_title.SetLabel("(Belum memilih Todo)"); self.sheet_list.Set([]); self.clear_tasks()
-            self.load_todo_files()
+            self.store.delete_todo(name)
     def on_select_todo(self,e):
         name=self.get_selected_todo_name(); 
         if not name: return
-        path=self.file_map[name]; self.current_file=path; self.current_name=name; self.lbl_title.SetLabel(f"# {name}"); self.load_sheets()
+        self.current_name=name; self.current_sheet=None; self.lbl_title.SetLabel(f"# {name}"); self.load_sheets()
+
+    # === Save state
+    def show_save_state(self,state,detail=""):
+        if not self: return
+        labels={"pending":("Tercatat di journal",YELLOW),"saving":("Menyimpan…",YELLOW),"saved":("Tersimpan",GREY_NOTE),"error":("Gagal simpan",wx.Colour(200,0,0))}
+        label,colour=labels[state]; self.save_text.SetLabel(label); self.save_text.SetForegroundColour(colour); self.save_text.SetToolTip(detail or label)
+        self.save_text.GetParent().Layout()
+        if state=="saved" and self.git_watcher: self.git_watcher.touch()  # file kita sendiri baru ditulis: git status pasti berubah
+    def flush_saves(self):
+        """Tunggu semua perubahan sampai di disk. False kalau ada yang gagal."""
+        busy=wx.BusyCursor(); ok=self.store.flush(); del busy
+        return ok
+    def on_close(self,e):
+        if self.git_job and self.git_job.is_running(): self.git_job.cancel(); self.git_job.join(5)
+        # git belum juga selesai: simpan masih ditahan, jangan ditunggu; perubahan sudah aman di journal
+        git_busy=bool(self.git_job and self.git_job.is_running())
+        if not git_busy and not self.flush_saves() and e.CanVeto():
+            if wx.MessageBox(f"Perubahan gagal disimpan:\n{self.store.last_error}\n\nTetap keluar?","Simpan",wx.YES_NO)!=wx.YES: e.Veto(); return
+        self.startup_call.Stop(); self.timer.Stop(); self.store.close(timeout=0 if git_busy else 5); e.Skip()
+        if self.git_watcher: self.git_watcher.stop()
 
     # === CRUD Section
     def on_select_sheet(self,e): self.current_sheet=self.sheet_list.GetStringSelection(); self.show_tasks()
     def load_sheets(self):
-        wb=openpyxl.load_workbook(self.current_file); names=wb.sheetnames; self.sheet_list.Set(names)
+        names=self.store.sections(self.current_name); self.sheet_list.Set(names)
         if not names: return
-        self.current_sheet=names[0]; self.sheet_list.SetSelection(0); self.show_tasks()
+        if self.current_sheet not in names: self.current_sheet=names[0]
+        self.sheet_list.SetStringSelection(self.current_sheet); self.show_tasks()
+    def on_section_event(self,todo,section,new=None):
+        if not self or todo!=self.current_name: return
+        if section==self.current_sheet: self.current_sheet=new  # rename: ikut nama baru; hapus: None -> section pertama
+        self.load_sheets()
     def add_section(self,e):
-        if not self.current_file: return
+        if not self.current_name: return
         dlg=SectionDialog(self,title="Tambah Section"); 
         if dlg.ShowModal()==wx.ID_OK:
             name=dlg.get_value(); 
             if not name: return
-            wb=openpyxl.load_workbook(self.current_file); 
-            if name in wb.sheetnames: wx.MessageBox("Section sudah ada","Error"); return
-            ws=wb.create_sheet(name); ws.append(HEADER); wb.save(self.current_file); self.current_sheet=name; self.load_sheets()
+            if name in self.store.sections(self.current_name): wx.MessageBox("Section sudah ada","Error"); return
+            if sheet_title_error(name): wx.MessageBox(sheet_title_error(name),"Error"); return
+            self.current_sheet=name; self.store.add_section(self.current_name,name)
         dlg.Destroy()
     def rename_section(self,e):
-        if not self.current_file or not self.current_sheet: return
+        if not self.current_name or not self.current_sheet: return
         dlg=SectionDialog(self,title="Rename Section",name=self.current_sheet); 
         if dlg.ShowModal()==wx.ID_OK:
             new_name=dlg.get_value(); 
             if not new_name: return
-            wb=openpyxl.load_workbook(self.current_file); 
-            if new_name in wb.sheetnames: wx.MessageBox("Section sudah ada","Error"); return
-            ws=wb[self.current_sheet]; ws.title=new_name; wb.save(self.current_file); self.current_sheet=new_name; self.load_sheets()
+            if new_name in self.store.sections(self.current_name): wx.MessageBox("Section sudah ada","Error"); return
+            if sheet_title_error(new_name): wx.MessageBox(sheet_title_error(new_name),"Error"); return
+            self.store.rename_section(self.current_name,self.current_sheet,new_name)
         dlg.Destroy()
     def delete_section(self,e):
-        if not self.current_file or not self.current_sheet: return
-        wb=openpyxl.load_workbook(self.current_file); 
-        if len(wb.sheetnames)<=1: wx.MessageBox("Minimal 1 section","Info"); return
-        ws=wb[self.current_sheet]; wb.remove(ws); wb.save(self.current_file); self.current_sheet=None; self.load_sheets()
+        if not self.current_name or not self.current_sheet: return
+        if len(self.store.sections(self.current_name))<=1: wx.MessageBox("Minimal 1 section","Info"); return
+        self.store.delete_section(self.current_name,self.current_sheet)
 
     # === CRUD Task
     def clear_tasks(self): 
-        for c in self.task_area.GetChildren():
-            c.Destroy()
-        self.task_sizer.Layout(); self.scroll.Layout()
-    def refresh_date_filter(self,ws,keep_selection=None):
-        dates=set()
-        for row in ws.iter_rows(min_row=2,values_only=True):
-            _,_,_,tanggal=safe_unpack(row)
-            if tanggal: dates.add(str(tanggal)[:7])
-        items=["Semua Tanggal"]+sorted(dates); self.date_filter.Set(items)
+        for row_panel in self.task_rows.values():
+            self.recycle_task_row(row_panel)
+        self.task_rows={}; self.task_sizer.Layout(); self.scroll.Layout()
+    def refresh_date_filter(self,keep_selection=None):
+        items=["Semua Tanggal"]+self.store.months(self.current_name,self.current_sheet); self.date_filter.Set(items)
         if keep_selection and keep_selection in items: self.date_filter.SetStringSelection(keep_selection)
         else: self.date_filter.SetSelection(0)
+    def sync_date_filter(self):
+        """Perbarui daftar bulan setelah mutasi; False (dan area task dibangun ulang) kalau bulan terpilih hilang."""
+        month=self.current_month(); self.refresh_date_filter(keep_selection=self.date_filter.GetStringSelection())
+        if self.current_month()!=month: self.show_tasks(); return False
+        return True
+    def current_month(self):
+        val=self.date_filter.GetStringSelection(); return None if val in ("","Semua Tanggal") else val
     def show_tasks(self):
-        self.clear_tasks()
-        if not self.current_file or not self.current_sheet: return
-        wb=openpyxl.load_workbook(self.current_file); ws=wb[self.current_sheet]
-        if ws.max_row==0: ws.append(HEADER); wb.save(self.current_file)
-        selected_filter=self.date_filter.GetStringSelection()
-        self.refresh_date_filter(ws,keep_selection=selected_filter)
-        filter_val=self.date_filter.GetStringSelection()
-        for row in ws.iter_rows(min_row=2,values_only=True):
-            task,status,note,tanggal=safe_unpack(row)
-            if not task: continue
-            status=int(status) if status else 0; note=note or ""; tanggal=tanggal or ""
-            if filter_val!="Semua Tanggal" and not str(tanggal).startswith(filter_val): continue
-            row_panel=wx.Panel(self.task_area); row_panel.SetBackgroundColour(BG_PANEL); vs=wx.BoxSizer(wx.VERTICAL)
-            top=wx.BoxSizer(wx.HORIZONTAL)
-            cb=wx.CheckBox(row_panel,label=f"{task} [{tanggal}]"); cb.SetValue(bool(status))
-            cb.SetForegroundColour(GREY_DONE if status else YELLOW); cb.Bind(wx.EVT_CHECKBOX,lambda e,t=str(task):self.toggle_task(e,t))
-            btn_edit=wx.Button(row_panel,label="Edit",size=(72,26)); btn_del=wx.Button(row_panel,label="Hapus",size=(72,26))
-            btn_edit.Bind(wx.EVT_BUTTON,lambda e,t=str(task):self.edit_item(t)); btn_del.Bind(wx.EVT_BUTTON,lambda e,t=str(task):self.delete_item(t))
-            top.Add(cb,1,wx.ALL|wx.ALIGN_CENTER_VERTICAL,6); top.Add(btn_edit,0,wx.ALL,6); top.Add(btn_del,0,wx.ALL,6); vs.Add(top,0,wx.EXPAND)
-            if note: txt=wx.StaticText(row_panel,label=str(note)); txt.SetForegroundColour(GREY_NOTE); vs.Add(txt,0,wx.LEFT|wx.RIGHT|wx.BOTTOM,10)
-            row_panel.SetSizer(vs); self.task_sizer.Add(row_panel,0,wx.EXPAND|wx.ALL,5)
-        self.task_sizer.Layout(); self.scroll.Layout(); self.load_todo_files(preserve=self.current_name)
+        """Bangun ulang seluruh area task (ganti todo/section/filter). Mutasi satu task cukup refresh_task/drop_task."""
+        keep=set(self.selected_keys()); self.scroll.Freeze(); self.clear_tasks()
+        if not self.current_name or not self.current_sheet: self.task_list.set_tasks([]); self.select_tasks(()); self.scroll.Thaw(); return
+        self.refresh_date_filter(keep_selection=self.date_filter.GetStringSelection())
+        tasks=self.store.tasks(self.current_name,self.current_sheet,month=self.current_month())
+        virtual=len(tasks)>=VIRTUAL_LIST_MIN
+        if virtual!=self.task_list.IsShown(): self.scroll.Show(not virtual); self.task_list.Show(virtual); self.scroll.GetParent().Layout()
+        self.task_list.set_tasks(tasks if virtual else [])
+        if not virtual:
+            for t in tasks: self.add_task_row(t,layout=False)
+        self.select_tasks(keep&{t.key for t in tasks},anchor=self.select_anchor)  # task terpilih yang masih tampil tetap terpilih
+        self.layout_tasks(); self.scroll.Thaw()
+    def layout_tasks(self):
+        self.scroll.Freeze(); self.task_sizer.Layout(); self.scroll.Layout(); self.scroll.FitInside(); self.scroll.Thaw()
+    def add_task_row(self,t,layout=True):
+        row_panel=self.row_pool.pop() if self.row_pool else self.new_task_row()
+        self.fill_task_row(row_panel,t); row_panel.Show()
+        self.task_sizer.Add(row_panel,0,wx.EXPAND|wx.ALL,5); self.task_rows[t.key]=row_panel
+        if layout: self.layout_tasks()
+    def new_task_row(self):
+        """Panel baris task kosong; handler membaca row_panel.key saat dipanggil, jadi panel bisa dipakai ulang."""
+        row_panel=wx.Panel(self.task_area); row_panel.SetBackgroundColour(BG_PANEL); vs=wx.BoxSizer(wx.VERTICAL)
+        top=wx.BoxSizer(wx.HORIZONTAL)
+        cb=wx.CheckBox(row_panel); cb.Bind(wx.EVT_CHECKBOX,lambda e,p=row_panel:self.toggle_task(p.key,e.IsChecked()))
+        btn_edit=wx.Button(row_panel,label="Edit",size=(72,26)); btn_del=wx.Button(row_panel,label="Hapus",size=(72,26))
+        btn_edit.Bind(wx.EVT_BUTTON,lambda e,p=row_panel:self.edit_item(p.key)); btn_del.Bind(wx.EVT_BUTTON,lambda e,p=row_panel:self.delete_item(p.key))
+        # checkbox selebar teksnya saja; sisa baris (milik row_panel) menerima klik untuk memilih task
+        top.Add(cb,0,wx.ALL|wx.ALIGN_CENTER_VERTICAL,6); top.AddStretchSpacer(); top.Add(btn_edit,0,wx.ALL,6); top.Add(btn_del,0,wx.ALL,6); vs.Add(top,0,wx.EXPAND)
+        txt=wx.StaticText(row_panel); txt.SetForegroundColour(GREY_NOTE); vs.Add(txt,0,wx.LEFT|wx.RIGHT|wx.BOTTOM,10)
+        for w in (row_panel,txt): w.Bind(wx.EVT_LEFT_DOWN,lambda e,p=row_panel:self.click_task_row(p.key,e))
+        row_panel.SetSizer(vs); row_panel.cb=cb; row_panel.note=txt
+        return row_panel
+    def recycle_task_row(self,row_panel):
+        self.task_sizer.Detach(row_panel); row_panel.Hide()
+        if len(self.row_pool)<self.row_pool_max: self.row_pool.append(row_panel)
+        else: row_panel.Destroy()
+    def fill_task_row(self,row_panel,t):
+        row_panel.key=t.key; row_panel.cb.SetLabel(f"{t.task} [{t.tanggal}]"); row_panel.cb.SetValue(bool(t.status)); row_panel.cb.SetForegroundColour(GREY_DONE if t.status else YELLOW)
+        row_panel.note.SetLabel(str(t.note)); row_panel.note.Show(bool(t.note)); self.paint_task_row(row_panel)
+    def refresh_task(self,key):
+        """Satu task baru/berubah: perbarui barisnya saja, atau buang kalau tidak lolos filter tanggal."""
+        t=self.store.get_task(self.current_name,self.current_sheet,key); month=self.current_month()
+        if t is None or (month and not str(t.tanggal).startswith(month)): self.drop_task(key); return
+        if self.task_list.IsShown(): self.task_list.put_task(t); return
+        row_panel=self.task_rows.get(key)
+        if row_panel is None: self.add_task_row(t); return
+        relayout=row_panel.note.IsShown()!=bool(t.note) or row_panel.note.GetLabel()!=str(t.note)
+        self.fill_task_row(row_panel,t); row_panel.cb.Refresh()
+        if relayout: row_panel.Layout(); self.layout_tasks()
+    def drop_task(self,key):
+        self.selected.discard(key)
+        if self.task_list.IsShown(): self.task_list.remove_task(key)
+        else:
+            row_panel=self.task_rows.pop(key,None)
+            if row_panel: self.recycle_task_row(row_panel); self.layout_tasks()
+        self.update_bulk_bar()
+    def on_task_event(self,event,todo,section,key,status=None):
+        """Satu task berubah: hanya baris itu (dan daftar bulan kalau tanggal bisa berubah) yang diperbarui."""
+        if not self or todo!=self.current_name or section!=self.current_sheet: return
+        if event=="task_toggled": self.refresh_task(key)
+        elif event=="task_deleted": self.drop_task(key); self.sync_date_filter()
+        elif self.sync_date_filter(): self.refresh_task(key)
     def add_item(self,e):
-        if not self.current_file or not self.current_sheet: return
+        if not self.current_name or not self.current_sheet: return
         dlg=ItemDialog(self,title="Tambah Task"); 
         if dlg.ShowModal()==wx.ID_OK:
             task,note,tanggal=dlg.get_values(); 
             if not task: return
-            wb=openpyxl.load_workbook(self.current_file); ws=wb[self.current_sheet]; ws.append([task,0,note,tanggal]); wb.save(self.current_file); self.show_tasks()
+            self.store.add_task(self.current_name,self.current_sheet,task,note,tanggal)
         dlg.Destroy()
-    def edit_item(self,task_name):
-        wb=openpyxl.load_workbook(self.current_file); ws=wb[self.current_sheet]; row_idx=None; curr_note=""; curr_tanggal=""
-        for i,row in enumerate(ws.iter_rows(min_row=2,values_only=True),start=2):
-            t,s,n,d=safe_unpack(row)
-            if str(t)==task_name: row_idx=i; curr_note=n or ""; curr_tanggal=d or ""; break
-        if not row_idx: return
-        dlg=ItemDialog(self,title="Edit Task",task=task_name,note=curr_note,tanggal=curr_tanggal)
+    def edit_item(self,key):
+        t=self.store.get_task(self.current_name,self.current_sheet,key)
+        if t is None: return
+        dlg=ItemDialog(self,title="Edit Task",task=t.task,note=t.note,tanggal=t.tanggal)
         if dlg.ShowModal()==wx.ID_OK:
-            new_task,new_note,new_tanggal=dlg.get_values(); ws.cell(row=row_idx,column=1).value=new_task; ws.cell(row=row_idx,column=3).value=new_note; ws.cell(row=row_idx,column=4).value=new_tanggal; wb.save(self.current_file); self.show_tasks()
+            new_task,new_note,new_tanggal=dlg.get_values()
+            self.store.edit_task(self.current_name,self.current_sheet,key,new_task,new_note,new_tanggal)
         dlg.Destroy()
-    def delete_item(self,task_name):
-        wb=openpyxl.load_workbook(self.current_file); ws=wb[self.current_sheet]
-        for i,row in enumerate(ws.iter_rows(min_row=2,values_only=True),start=2):
-            t,_,_,_=safe_unpack(row)
-            if str(t)==task_name: ws.delete_rows(i,1); break
-        wb.save(self.current_file); self.show_tasks()
-    def toggle_task(self,e,task_name):
-        wb=openpyxl.load_workbook(self.current_file); ws=wb[self.current_sheet]
-        for row in ws.iter_rows(min_row=2):
-            if str(row[0].value)==task_name: row[1].value=1 if e.IsChecked() else 0; break
-        wb.save(self.current_file); self.show_tasks()
+    def delete_item(self,key):
+        self.store.delete_task(self.current_name,self.current_sheet,key)
+    def toggle_task(self,key,checked):
+        self.store.set_status(self.current_name,self.current_sheet,key,1 if checked else 0)
+
+    # === Banyak task sekaligus
+    def selected_keys(self):
+        """Key task terpilih, urut seperti di layar."""
+        if self.task_list.IsShown(): return self.task_list.selected_keys()
+        return [k for k in self.task_rows if k in self.selected]
+    def select_tasks(self,keys,anchor=None):
+        self.selected=set(keys); self.select_anchor=anchor
+        if self.task_list.IsShown(): self.task_list.select_keys(self.selected)
+        for row_panel in self.task_rows.values(): self.paint_task_row(row_panel)
+        self.update_bulk_bar()
+    def select_all_tasks(self):
+        """Semua task yang lolos filter tanggal saat ini."""
+        self.select_tasks(self.task_list.keys() if self.task_list.IsShown() else list(self.task_rows))
+    def click_task_row(self,key,e):
+        """Klik baris (di luar checkbox/tombol): pilih satu; Ctrl tambah/lepas; Shift rentang dari klik terakhir."""
+        if e.ShiftDown() and self.select_anchor in self.task_rows:
+            keys=list(self.task_rows); a,b=sorted((keys.index(self.select_anchor),keys.index(key))); picked=set(keys[a:b+1])
+            self.select_tasks(picked|self.selected if e.CmdDown() else picked,anchor=self.select_anchor)
+        elif e.CmdDown(): self.select_tasks(self.selected^{key},anchor=key)
+        else: self.select_tasks({key},anchor=key)
+    def paint_task_row(self,row_panel):
+        colour=BG_SELECTED if row_panel.key in self.selected else BG_PANEL
+        if row_panel.GetBackgroundColour()!=colour: row_panel.SetBackgroundColour(colour); row_panel.Refresh()
+    def update_bulk_bar(self):
+        n=len(self.selected_keys()); self.sel_text.SetLabel(f"{n} dipilih" if n else "")
+        for b in self.bulk_buttons: b.Enable(n>0)
+        self.sel_text.GetParent().Layout()
+    def bulk_run(self,keys,apply):
+        """apply(batch,key) untuk tiap task dalam satu batch: sekali simpan, layar dibangun ulang sekali (todo_updated)."""
+        if not keys: return
+        try:
+            with self.store.batch(self.current_name) as b:
+                for key in keys: apply(b,key)
+        except Exception as ex: wx.MessageBox(f"Gagal, tidak ada task yang diubah:\n{ex}","Error")
+    def bulk_set_status(self,status):
+        self.bulk_run(self.selected_keys(),lambda b,key:b.set_status(self.current_sheet,key,status))
+    def bulk_delete(self,e):
+        keys=self.selected_keys()
+        if keys and wx.MessageBox(f"Hapus {len(keys)} task?","Konfirmasi",wx.YES_NO)==wx.YES: self.bulk_run(keys,lambda b,key:b.delete_task(self.current_sheet,key))
+    def bulk_move(self,e):
+        keys=self.selected_keys(); others=[s for s in self.store.sections(self.current_name) if s!=self.current_sheet]
+        if not keys: return
+        if not others: wx.MessageBox("Tidak ada section lain","Info"); return
+        dlg=wx.SingleChoiceDialog(self,f"Pindahkan {len(keys)} task ke section:","Pindah Section",others)
+        if dlg.ShowModal()==wx.ID_OK:
+            target=dlg.GetStringSelection(); self.bulk_run(keys,lambda b,key:b.move_task(self.current_sheet,key,target))
+        dlg.Destroy()
+    def bulk_change_date(self,e):
+        keys=self.selected_keys()
+        if not keys: return
+        dlg=DateDialog(self,title=f"Ubah Tanggal {len(keys)} Task")
+        if dlg.ShowModal()==wx.ID_OK:
+            tanggal=dlg.get_value()
+            def apply(b,key):
+                t=b.get_task(self.current_sheet,key)
+                if t: b.edit_task(self.current_sheet,key,t.task,t.note,tanggal)
+            self.bulk_run(keys,apply)
+        dlg.Destroy()
+
+def main(argv=None):
+    parser=argparse.ArgumentParser(description="Excel Todo Manager")
+    parser.add_argument("--store",choices=["xlsx","sqlite"],default=STORE_BACKEND,help="backend penyimpanan")
+    parser.add_argument("--git-add-all",action="store_true",default=GIT_STAGE_ALL,help="push men-stage semua file (git add .)")
+    parser.add_argument("--row-pool",type=int,default=ROW_POOL_MAX,metavar="N",help="maksimal panel baris task nganggur yang disimpan")
+    parser.add_argument("--xlsx-to-sqlite",action="store_true",help="impor semua todo xlsx ke SQLite lalu keluar")
+    parser.add_argument("--sqlite-to-xlsx",action="store_true",help="ekspor semua todo SQLite ke xlsx lalu keluar")
+    parser.add_argument("--profile-startup",action="store_true",help="cetak durasi tiap fase startup")
+    args=parser.parse_args(argv)
+    if args.xlsx_to_sqlite or args.sqlite_to_xlsx:
+        print(f"{migrate(args.xlsx_to_sqlite)} todo disalin."); return
+    profile=StartupProfile(_T0,enabled=args.profile_startup,wait=("sidebar dari cache","git status pertama","scan progress")); profile.mark("import")
+    app=wx.App(); profile.mark("wx.App"); store=open_store(args.store); profile.mark("buka store")
+    TodoApp(store,row_pool_max=max(0,args.row_pool),stage_all=args.git_add_all,profile=profile); app.MainLoop()
 
 
 if __name__=="__main__":
-    app=wx.App(); TodoApp(); app.MainLoop()
+    main()
@@ -0,0 +1,79 @@
+"""
+Inti data todo tanpa wx: penyimpanan (xlsx/SQLite), progress, filter
+tanggal, index, journal dan helper git. Bisa dipakai dari script, cron
+atau benchmark tanpa display; todo_wx_excel_git.py hanya lapisan UI di atasnya.
+
+    from todocore import open_store
+    store = open_store("xlsx")
+    for t in store.tasks("Kerja", "Default", month="2025-09"):
+        ...
+    store.close()
+"""
+from .config import (
+    DATA_DIR,
+    GIT_STAGE_ALL,
+    GIT_UNTRACKED,
+    GIT_WATCH_DELAY,
+    HEADER,
+    ID_COL,
+    INDEX_PATH,
+    JOURNAL_COMPACT_OPS,
+    SQLITE_PATH,
+    STORE_BACKEND,
+)
+from .dates import DateIndex, date_range
+from .events import EventBus
+from .git import (
+    GIT,
+    GitJob,
+    GitRunner,
+    GitStatusPoller,
+    GitWatcher,
+    WrittenFiles,
+    find_repo_root,
+    git_file_state,
+    git_is_repo,
+    git_pull,
+    git_push,
+    git_stage,
+    git_status,
+    git_status_map,
+    parse_porcelain_v2,
+)
+from .journal import TodoJournal, apply_journal_op, remove_blank_rows
+from .progress import (
+    ProgressIndex,
+    calc_section_progress,
+    calc_todo_progress,
+    progress_percent,
+    scan_progress_parallel,
+    scan_todo_file,
+    stream_section_progress,
+)
+from .storage import (
+    SqliteTodoStore,
+    Task,
+    TodoBatch,
+    TodoStore,
+    XlsxTodoStore,
+    copy_todos,
+    migrate,
+    normalize_status,
+    open_store,
+)
+from .workbook import (
+    SaveQueue,
+    WorkbookCache,
+    count_row,
+    count_sheet_rows,
+    count_workbook_sections,
+    create_new_todo_excel,
+    ensure_data_dir,
+    file_hash,
+    file_signature,
+    hide_id_column,
+    legacy_task_id,
+    new_task_id,
+    safe_unpack,
+    sheet_title_error,
+)
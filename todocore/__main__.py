@@ -0,0 +1,43 @@
+"""
+Perintah batch tanpa wx:
+
+    python -m todocore --xlsx-to-sqlite
+    python -m todocore --sqlite-to-xlsx
+    python -m todocore --progress
+"""
+import argparse
+
+from .config import STORE_BACKEND
+from .progress import progress_percent
+from .storage import migrate, open_store
+
+
+def print_progress(backend):
+    store = open_store(backend)
+    try:
+        names = store.list_todos()
+        results = {}
+        store.scan_progress([n for n in names if store.cached_progress(n) is None], lambda n, s: results.__setitem__(n, s))
+        for name in names:
+            sections = results.get(name) or store.cached_progress(name) or {}
+            print(f"{name}: {progress_percent(sections)}%")
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m todocore", description="Perintah batch data todo")
+    parser.add_argument("--store", choices=["xlsx", "sqlite"], default=STORE_BACKEND, help="backend penyimpanan")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--xlsx-to-sqlite", action="store_true", help="impor semua todo xlsx ke SQLite")
+    group.add_argument("--sqlite-to-xlsx", action="store_true", help="ekspor semua todo SQLite ke xlsx")
+    group.add_argument("--progress", action="store_true", help="cetak progress tiap todo")
+    args = parser.parse_args(argv)
+    if args.progress:
+        print_progress(args.store)
+    else:
+        print(f"{migrate(args.xlsx_to_sqlite)} todo disalin.")
+
+
+if __name__ == "__main__":
+    main()
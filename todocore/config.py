@@ -0,0 +1,13 @@
+"""Konfigurasi data todo (tanpa wx)."""
+import os
+
+DATA_DIR = os.path.join("data", "todolist")
+HEADER = ["Task", "Status", "Note", "Tanggal", "ID"]  # Status: 0 = aktif, 1 = selesai
+ID_COL = HEADER.index("ID") + 1  # kolom ID task, disembunyikan di Excel
+INDEX_PATH = os.path.join(DATA_DIR, ".index")  # cache progress sidebar
+JOURNAL_COMPACT_OPS = 200  # op di journal: sebanyak ini langsung dipadatkan ke xlsx tanpa menunggu jeda tenang
+STORE_BACKEND = "xlsx"  # "xlsx" atau "sqlite"
+SQLITE_PATH = os.path.join("data", "todolist.db")
+GIT_WATCH_DELAY = 0.5  # detik tenang setelah perubahan file sebelum git status dijalankan
+GIT_STAGE_ALL = False  # True: push men-stage semua (git add .), bukan hanya file yang ditulis app
+GIT_UNTRACKED = "normal"  # -u untuk git status; "no" (-uno) lebih cepat di repo besar, tapi todo baru tidak terdeteksi
@@ -0,0 +1,73 @@
+"""Filter tanggal: batas query dan index tanggal per section."""
+import bisect
+
+
+# ===== Date Filter =====
+def date_range(start=None, end=None):
+    """
+    Batas [bawah, atas) query range pada kolom tanggal (bisa pakai index).
+    start/end inklusif dan boleh 'YYYY', 'YYYY-MM' atau 'YYYY-MM-DD';
+    kosong berarti tanpa batas di sisi itu.
+    """
+    return start or "", (end + "\uffff") if end else "\uffff"
+
+
+class DateIndex:
+    """
+    Index tanggal satu section: tanggal -> {ID task} plus daftar tanggal
+    terurut, jadi daftar bulan, filter bulan/hari dan rentang tanggal tidak
+    perlu scan seluruh sheet. Diperbarui per task lewat put/remove.
+    """
+
+    def __init__(self):
+        self.by_id = {}  # ID task -> tanggal
+        self.by_date = {}  # tanggal -> {ID task}
+        self.dates = []  # tanggal unik, terurut
+        self.month_count = {}  # 'YYYY-MM' -> jumlah task
+
+    def put(self, key, tanggal):
+        tanggal = str(tanggal or "")
+        if self.by_id.get(key) == tanggal:
+            return
+        self.remove(key)
+        if not tanggal:
+            return
+        self.by_id[key] = tanggal
+        keys = self.by_date.get(tanggal)
+        if keys is None:
+            keys = self.by_date[tanggal] = set()
+            bisect.insort(self.dates, tanggal)
+        keys.add(key)
+        month = tanggal[:7]
+        self.month_count[month] = self.month_count.get(month, 0) + 1
+
+    def remove(self, key):
+        tanggal = self.by_id.pop(key, None)
+        if tanggal is None:
+            return
+        keys = self.by_date[tanggal]
+        keys.discard(key)
+        if not keys:
+            del self.by_date[tanggal]
+            del self.dates[bisect.bisect_left(self.dates, tanggal)]
+        month = tanggal[:7]
+        self.month_count[month] -= 1
+        if not self.month_count[month]:
+            del self.month_count[month]
+
+    def months(self):
+        return sorted(self.month_count)
+
+    def between(self, start=None, end=None):
+        """ID task dengan start <= tanggal <= end (lihat date_range)."""
+        lo, hi = date_range(start, end)
+        result = set()
+        for tanggal in self.dates[bisect.bisect_left(self.dates, lo):bisect.bisect_left(self.dates, hi)]:
+            result.update(self.by_date[tanggal])
+        return result
+
+    def month(self, month):
+        return self.between(month, month)
+
+    def day(self, day):
+        return self.between(day, day)
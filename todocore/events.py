@@ -0,0 +1,35 @@
+"""Event bus perubahan data."""
+import threading
+
+
+# ===== Event Bus =====
+class EventBus:
+    """
+    Pub/sub kecil untuk perubahan data. emit(event, **data) memanggil tiap
+    handler(**data) yang di-subscribe ke event itu, di thread pemanggil emit
+    (handler UI harus membungkus dirinya dengan wx.CallAfter). Handler "*"
+    menerima semua event sebagai handler(event, **data).
+    """
+
+    def __init__(self):
+        self._handlers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, event, handler):
+        with self._lock:
+            self._handlers.setdefault(event, []).append(handler)
+        return handler
+
+    def unsubscribe(self, event, handler):
+        with self._lock:
+            if handler in self._handlers.get(event, ()):
+                self._handlers[event].remove(handler)
+
+    def emit(self, event, **data):
+        with self._lock:
+            handlers = list(self._handlers.get(event, ()))
+            catch_all = list(self._handlers.get("*", ()))
+        for handler in handlers:
+            handler(**data)
+        for handler in catch_all:
+            handler(event, **data)
@@ -0,0 +1,518 @@
+"""Helper git: runner, status (per file), pull/push/stage, job background, poller dan watcher."""
+import os
+import re
+import json
+import time
+import codecs
+import datetime
+import threading
+
+from .config import GIT_UNTRACKED, GIT_WATCH_DELAY
+
+
+# ===== Git Helpers =====
+class GitRunner:
+    """
+    Jalankan perintah git dengan environment yang disiapkan sekali, dan catat
+    latency per perintah (stats: perintah -> [jumlah, total detik, terakhir, maks]).
+
+    GIT_OPTIONAL_LOCKS=0 membuat git status tidak menulis ulang .git/index,
+    jadi poll tidak memicu GitWatcher lagi dan tidak bentrok dengan commit.
+    """
+
+    def __init__(self):
+        self.env = dict(os.environ, GIT_TERMINAL_PROMPT="0", GIT_OPTIONAL_LOCKS="0")
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    @property
+    def creationflags(self):
+        import subprocess
+
+        return getattr(subprocess, "CREATE_NO_WINDOW", 0)  # Windows: tanpa jendela console
+
+    def run(self, args, repo_dir):
+        import subprocess  # di-import saat git pertama dijalankan (setelah jendela tampil)
+
+        t0 = time.perf_counter()
+        try:
+            return subprocess.run(
+                ["git"] + args,
+                cwd=repo_dir,
+                env=self.env,
+                capture_output=True,
+                text=True,
+                check=False,
+                creationflags=self.creationflags,
+            )
+        except Exception as e:
+            return None
+        finally:
+            self.record(args[0], time.perf_counter() - t0)
+
+    def record(self, command, seconds):
+        with self._lock:
+            stat = self.stats.setdefault(command, [0, 0.0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = seconds
+            stat[3] = max(stat[3], seconds)
+
+    def last_latency(self, command):
+        with self._lock:
+            stat = self.stats.get(command)
+            return stat[2] if stat else None
+
+
+GIT = GitRunner()
+
+
+def _run_git(args, repo_dir):
+    return GIT.run(args, repo_dir)
+
+
+_repo_roots = {}  # start_path -> root repo yang sudah ditemukan
+
+
+def find_repo_root(start_path=None):
+    """
+    Cari root repo git dengan mencari folder .git ke atas.
+    Jika tidak ketemu, kembalikan None.
+    """
+    if start_path is None:
+        try:
+            # lokasi file skrip
+            start_path = os.path.dirname(os.path.abspath(__file__))
+        except NameError:
+            # fallback: current working dir
+            start_path = os.getcwd()
+
+    start = path = os.path.abspath(start_path)
+    root = _repo_roots.get(start)
+    if root is not None:
+        if os.path.isdir(os.path.join(root, ".git")):
+            return root
+        del _repo_roots[start]  # .git hilang: cari ulang
+    while True:
+        if os.path.isdir(os.path.join(path, ".git")):
+            _repo_roots[start] = path
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def git_is_repo(repo_dir=None):
+    return find_repo_root(repo_dir) is not None
+
+
+def git_status(repo_dir=None):
+    root = find_repo_root(repo_dir)
+    if root is None:
+        return None  # bukan repo git
+    res = _run_git(["status", "--porcelain", f"--untracked-files={GIT_UNTRACKED}"], root)
+    if res is None or res.returncode != 0:
+        return None
+    return res.stdout.strip()  # string kosong berarti bersih
+
+
+def parse_porcelain_v2(out, root):
+    """
+    Output `git status --porcelain=v2 -z` -> {path absolut: state}, state
+    "modified", "untracked" atau "conflict". Folder untracked yang diringkas
+    git disimpan dengan os.sep di akhir (lihat git_file_state).
+    """
+    states = {}
+    entries = iter(out.split("\0"))
+    for entry in entries:
+        kind = entry[:1]
+        if kind == "1":
+            path, state = entry.split(" ", 8)[8], "modified"
+        elif kind == "2":
+            path, state = entry.split(" ", 9)[9], "modified"
+            next(entries, None)  # path asal rename
+        elif kind == "u":
+            path, state = entry.split(" ", 10)[10], "conflict"
+        elif kind == "?":
+            path, state = entry[2:], "untracked"
+        else:
+            continue  # "!" (ignored), "#" (header), sisa kosong
+        full = os.path.normcase(os.path.normpath(os.path.join(root, path)))
+        states[full + os.sep if path.endswith("/") else full] = state
+    return states
+
+
+def git_status_map(repo_dir=None):
+    """Satu git status untuk seluruh repo: {path: state} (kosong = bersih), None kalau bukan repo/error."""
+    root = find_repo_root(repo_dir)
+    if root is None:
+        return None
+    res = _run_git(["status", "--porcelain=v2", "-z", f"--untracked-files={GIT_UNTRACKED}"], root)
+    if res is None or res.returncode != 0:
+        return None
+    return parse_porcelain_v2(res.stdout, root)
+
+
+def git_file_state(states, path):
+    """State satu file dari hasil git_status_map, termasuk yang ada di folder untracked."""
+    if not states or not path:
+        return None
+    path = os.path.normcase(os.path.abspath(path))
+    if path in states:
+        return states[path]
+    parent = os.path.dirname(path)
+    while parent != os.path.dirname(parent):
+        if parent + os.sep in states:
+            return states[parent + os.sep]
+        parent = os.path.dirname(parent)
+    return None
+
+
+def git_pull(repo_dir=None, run=_run_git):
+    root = find_repo_root(repo_dir)
+    if root is None:
+        return (1, "Bukan repository git.")
+    # sama dengan pull --rebase, tapi dua langkah: fetch (jaringan) boleh dibatalkan,
+    # rebase (lokal, menulis index/work tree) tidak
+    res = run(["fetch"], root)
+    if res is None:
+        return (1, "Gagal menjalankan git.")
+    if res.returncode != 0:
+        return (res.returncode, res.stderr or res.stdout)
+    res = run(["rebase"], root)  # tanpa argumen: ke upstream branch, seperti pull
+    if res is None:
+        return (1, "Gagal menjalankan git.")
+    if res.returncode != 0:
+        # jangan tinggalkan rebase setengah jalan (rebase-merge/, konflik di work tree)
+        aborted = _run_git(["rebase", "--abort"], root)
+        note = "Rebase dibatalkan, repo kembali seperti sebelum pull." if aborted and aborted.returncode == 0 else ""
+        return (res.returncode, "\n".join(t for t in (res.stdout, res.stderr, note) if t))
+    return (res.returncode, res.stdout or res.stderr)
+
+
+def git_stage(root, paths, run=_run_git):
+    """
+    Stage hanya paths (di dalam repo): file yang ada lewat git add, file yang
+    sudah dihapus/di-rename lewat git rm --cached. Tidak menyentuh file lain.
+    """
+    inside = []
+    for p in paths:
+        try:
+            rel = os.path.relpath(os.path.abspath(p), root)
+        except ValueError:
+            continue  # beda drive (Windows), pasti di luar repo
+        if not rel.startswith(os.pardir):
+            inside.append(rel)
+    paths = inside
+    present = [p for p in paths if os.path.exists(os.path.join(root, p))]
+    missing = [p for p in paths if p not in present]
+    import subprocess
+
+    res = subprocess.CompletedProcess(["add"], 0, "", "")
+    if missing:
+        res = run(["rm", "--cached", "--quiet", "--ignore-unmatch", "--"] + missing, root)
+        if res is None or res.returncode != 0:
+            return res
+    if present:
+        res = run(["add", "--"] + present, root)
+    return res
+
+
+def git_push(repo_dir=None, auto_commit=True, run=_run_git, paths=None):
+    """paths: file yang di-stage sebelum commit; None = semua (git add .)."""
+    root = find_repo_root(repo_dir)
+    if root is None:
+        return (1, "Bukan repository git.")
+
+    if auto_commit:
+        if paths is None:
+            res_add = run(["add", "."], root)
+        else:
+            res_add = git_stage(root, paths, run)
+        if res_add is None or res_add.returncode != 0:
+            return (1, (res_add.stderr if res_add else "Gagal git add."))
+
+        # commit hanya jika ada perubahan staged
+        res_diff = run(["diff", "--cached", "--name-only"], root)
+        if res_diff and res_diff.stdout.strip():
+            msg = f"sync update {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            res_commit = run(["commit", "-m", msg], root)
+            # jika tidak ada perubahan, git commit akan returncode=1 dengan pesan "nothing to commit"
+            # itu tidak fatal, lanjut ke push
+        # else: tidak ada yang di-commit
+
+    res_push = run(["push"], root)
+    if res_push is None:
+        return (1, "Gagal menjalankan git push.")
+    return (res_push.returncode, res_push.stdout or res_push.stderr)
+
+
+class GitJob:
+    """
+    Jalankan git_pull/git_push di thread background. target(run) dipanggil
+    dengan run pengganti _run_git yang menambah --progress ke pull/push dan
+    mengalirkan stderr ke on_output(teks, transient); transient=True untuk
+    baris progress yang ditimpa (diakhiri \\r). cancel() menghentikan proses
+    git yang sedang jalan dan langkah sesudahnya; perintah di NO_CANCEL
+    (menulis index/work tree) dibiarkan selesai supaya tidak meninggalkan
+    index.lock atau rebase setengah jalan. on_done(code, output)
+    dipanggil sekali di akhir. Semua callback dari thread worker.
+    """
+
+    PROGRESS_COMMANDS = ("pull", "push", "fetch")
+    NO_CANCEL = ("rebase", "commit", "add", "rm")
+
+    def __init__(self, target, on_output=None, on_done=None):
+        self.target = target
+        self.on_output = on_output
+        self.on_done = on_done
+        self._cancel = threading.Event()
+        self._proc = None
+        self._command = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._main, name="GitJob", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def is_running(self):
+        return self._thread.is_alive()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        with self._lock:
+            if self._proc and self._proc.poll() is None and self._command not in self.NO_CANCEL:
+                self._proc.terminate()
+
+    def join(self, timeout=None):
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _main(self):
+        try:
+            code, out = self.target(self.run)
+        except Exception as e:
+            code, out = 1, str(e)
+        if self.cancelled:
+            code, out = 1, "Dibatalkan."
+        if self.on_done:
+            self.on_done(code, out)
+
+    def run(self, args, repo_dir):
+        if self.cancelled:
+            return None
+        if args[0] in self.PROGRESS_COMMANDS:
+            args = [args[0], "--progress"] + args[1:]
+        import subprocess
+
+        t0 = time.perf_counter()
+        try:
+            with self._lock:
+                if self.cancelled:
+                    return None
+                self._command = args[0]
+                self._proc = subprocess.Popen(
+                    ["git"] + args,
+                    cwd=repo_dir,
+                    env=GIT.env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    creationflags=GIT.creationflags,
+                )
+        except Exception:
+            return None
+        proc, stdout = self._proc, []
+        reader = threading.Thread(target=lambda: stdout.append(proc.stdout.read()), daemon=True)
+        reader.start()
+        stderr = self._stream(proc.stderr)
+        reader.join()
+        proc.wait()
+        GIT.record(args[0], time.perf_counter() - t0)
+        out = b"".join(stdout).decode("utf-8", "replace")
+        return subprocess.CompletedProcess(args, proc.returncode, out, stderr)
+
+    def _stream(self, pipe):
+        """Baca stderr per potongan; baris diakhiri \\r (progress) dikirim sebagai transient."""
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        lines, buf = [], ""
+        while True:
+            chunk = pipe.read1(4096)
+            buf += decoder.decode(chunk, final=not chunk)
+            parts = re.split(r"(\r\n|\r|\n)", buf)
+            buf = parts.pop()
+            for text, sep in zip(parts[::2], parts[1::2]):
+                transient = sep == "\r"
+                if not transient:
+                    lines.append(text)
+                if self.on_output and text.strip():
+                    self.on_output(text, transient)
+            if not chunk:
+                if buf.strip():
+                    lines.append(buf)
+                    if self.on_output:
+                        self.on_output(buf, False)
+                return "\n".join(lines)
+
+
+class GitStatusPoller:
+    """
+    Jalankan git_status di thread lain supaya UI tidak pernah menunggu git.
+    request() langsung kembali; kalau poll sebelumnya masih jalan, cukup
+    ditandai untuk diulang sekali setelah selesai, jadi poll tidak menumpuk.
+    Hasil (lihat git_status_map) dikirim ke on_result dari thread worker.
+    """
+
+    def __init__(self, on_result, repo_dir=None):
+        self.on_result = on_result
+        self.repo_dir = repo_dir
+        self._lock = threading.Lock()
+        self._running = False
+        self._again = False
+
+    def request(self):
+        with self._lock:
+            if self._running:
+                self._again = True
+                return
+            self._running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                self.on_result(git_status_map(self.repo_dir))
+            except Exception:
+                pass  # jangan sampai poller macet; poll berikutnya coba lagi
+            with self._lock:
+                if not self._again:
+                    self._running = False
+                    return
+                self._again = False
+
+
+class GitWatcher:
+    """
+    Pantau work tree repo lewat watchdog dan panggil on_change sekali setelah
+    perubahan reda (debounce GIT_WATCH_DELAY). Di dalam .git hanya index,
+    HEAD dan refs yang dihitung; file milik app yang di-ignore git (journal,
+    .index, tmp) dilewati. touch() dipakai app sebagai petunjuk langsung
+    setelah ia sendiri menyimpan file, juga saat watcher tidak jalan.
+    """
+
+    IGNORE_SUFFIXES = (".journal", ".index", ".written", ".tmp", ".db-wal", ".db-shm", ".lock")
+    # hanya perubahan isi; "opened"/"closed_no_write" (watchdog >= 6) muncul tiap kali
+    # git status sendiri membaca HEAD/refs/index, jadi poll akan memicu dirinya terus
+    CHANGE_EVENTS = ("created", "modified", "deleted", "moved")
+
+    def __init__(self, root, on_change, delay=GIT_WATCH_DELAY):
+        self.root = os.path.abspath(root)
+        self.on_change = on_change
+        self.delay = delay
+        self._observer = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Mulai memantau; False kalau watchdog tidak ada atau gagal (pakai poll timer)."""
+        try:
+            # watchdog opsional dan baru dimuat di sini, setelah jendela tampil;
+            # tanpa itu git status di-poll timer
+            from watchdog.observers import Observer
+
+            observer = Observer()
+            observer.schedule(self, self.root, recursive=True)
+            observer.start()
+        except Exception:
+            return False
+        self._observer = observer
+        return True
+
+    def stop(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+        if self._observer:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+
+    def relevant(self, path):
+        rel = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+        if rel == ".git" or rel.startswith(".git/"):
+            return rel in (".git/index", ".git/HEAD") or rel.startswith(".git/refs/")
+        name = rel.rsplit("/", 1)[-1]
+        return not name.endswith(self.IGNORE_SUFFIXES) and ".orphan-" not in name
+
+    def dispatch(self, event):
+        """Dipanggil observer watchdog (cukup duck-typing, tanpa FileSystemEventHandler)."""
+        self.on_any_event(event)
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return  # folder kosong tidak terlihat git; isinya memicu event sendiri
+        if getattr(event, "event_type", None) not in self.CHANGE_EVENTS:
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        if any(p and self.relevant(os.fsdecode(p)) for p in paths):
+            self.touch()
+
+    def touch(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            self._timer = None
+        self.on_change()
+
+
+# ===== Written Files =====
+class WrittenFiles:
+    """
+    Daftar file data yang ditulis app sejak push terakhir (JSON di disk, jadi
+    tetap ada setelah app ditutup). Push hanya men-stage file-file ini.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.paths = set(json.load(f))
+        except (OSError, ValueError, TypeError):
+            self.paths = set()
+
+    def add(self, *paths):
+        with self._lock:
+            new = {os.path.abspath(p) for p in paths} - self.paths
+            if new:
+                self.paths |= new
+                self._save()
+
+    def snapshot(self):
+        with self._lock:
+            return sorted(self.paths)
+
+    def discard(self, paths):
+        with self._lock:
+            self.paths -= set(paths)
+            self._save()
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(sorted(self.paths), f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # paling buruk push berikutnya tidak men-stage file ini; GIT_STAGE_ALL tetap bisa
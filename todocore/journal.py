@@ -0,0 +1,182 @@
+"""Journal operasi (JSON lines) dan satu-satunya jalur mutasi workbook."""
+import os
+import json
+import datetime
+
+from .config import HEADER, ID_COL
+from .workbook import file_hash, hide_id_column
+
+
+# ===== Operation Journal =====
+def apply_journal_op(wb, op):
+    """Terapkan satu op journal ke workbook. Satu-satunya jalur mutasi data todo."""
+    kind, sheet = op["op"], op.get("sheet")
+    if kind == "add":
+        wb[sheet].append(op["row"])
+    elif kind == "edit":
+        ws = wb[sheet]
+        ws.cell(row=op["row"], column=1).value = op["task"]
+        ws.cell(row=op["row"], column=3).value = op["note"]
+        ws.cell(row=op["row"], column=4).value = op["tanggal"]
+    elif kind == "toggle":
+        wb[sheet].cell(row=op["row"], column=2).value = op["status"]
+    elif kind == "delete":
+        wb[sheet].delete_rows(op["row"], 1)
+    elif kind == "clear":
+        # hapus task tanpa menggeser baris di bawahnya; baris kosong dibuang saat "compact"
+        ws = wb[sheet]
+        for col in range(1, len(HEADER) + 1):
+            ws.cell(row=op["row"], column=col).value = None
+    elif kind == "compact":
+        for title in op["sheets"]:
+            if title in wb.sheetnames:
+                remove_blank_rows(wb[title])
+    elif kind == "assign_ids":
+        # file lama belum punya kolom ID: isi sekali, lalu tersimpan saat dipadatkan
+        ws = wb[sheet]
+        ws.cell(row=1, column=ID_COL).value = HEADER[ID_COL - 1]
+        hide_id_column(ws)
+        for row, task_id in op["ids"]:
+            ws.cell(row=row, column=ID_COL).value = task_id
+    elif kind == "header":
+        # sheet kosong tanpa header: tulis langsung di baris 1 (append bisa jatuh ke baris 2)
+        ws = wb[sheet]
+        for col, title in enumerate(HEADER, start=1):
+            ws.cell(row=1, column=col).value = title
+        hide_id_column(ws)
+    elif kind == "add_section":
+        ws = wb.create_sheet(sheet)
+        ws.append(HEADER)
+        hide_id_column(ws)
+    elif kind == "rename_section":
+        wb[sheet].title = op["new"]
+    elif kind == "delete_section":
+        wb.remove(wb[sheet])
+    else:
+        raise ValueError(f"op journal tidak dikenal: {kind}")
+
+
+def remove_blank_rows(ws):
+    """Buang baris kosong di bawah header, dari bawah ke atas per blok berurutan."""
+    blank = [
+        i for i, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2)
+        if all(v is None or str(v).strip() == "" for v in row)
+    ]
+    while blank:
+        end = blank.pop()
+        start = end
+        while blank and blank[-1] == start - 1:
+            start = blank.pop()
+        ws.delete_rows(start, end - start + 1)
+
+
+def _fsync(f):
+    f.flush()
+    sync = getattr(os, "fdatasync", os.fsync)
+    sync(f.fileno())
+
+
+class TodoJournal:
+    """
+    Journal append-only (JSON lines) di samping file todo, mis. Dua.xlsx.journal.
+    Baris pertama {"base": sha1 xlsx} mencatat isi xlsx saat journal dimulai;
+    baris berikutnya op yang belum masuk ke xlsx. Tiap append di-fsync, jadi
+    edit aman walau app crash; journal dihapus setelah dipadatkan ke xlsx.
+    """
+
+    def __init__(self, xlsx_path):
+        self.xlsx_path = xlsx_path
+        self.path = xlsx_path + ".journal"
+        self.count = 0  # jumlah op yang belum masuk xlsx
+        self.kinds = set()  # jenis op yang diterapkan saat replay
+        self._f = None
+
+    def append(self, op):
+        self.extend([op])
+
+    def extend(self, ops):
+        """Tulis beberapa op sekaligus dengan satu fsync (commit batch)."""
+        if self._f is None:
+            self._f = open(self.path, "a", encoding="utf-8")
+            if self._f.tell() == 0:
+                self._f.write(json.dumps({"base": file_hash(self.xlsx_path)}) + "\n")
+        self._f.write("".join(json.dumps(op, ensure_ascii=False) + "\n" for op in ops))
+        _fsync(self._f)
+        self.count += len(ops)
+
+    def replay(self, wb):
+        """
+        Terapkan op yang tersisa ke wb (hasil load xlsx). Kembalikan jumlah op,
+        atau None kalau ada op yang gagal: journal disisihkan (.orphan-*) dan
+        wb sudah berubah setengah jalan, jadi jangan dipakai atau disimpan.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                lines = f.readlines()
+        except OSError:
+            return 0
+        self.count = 0
+        if not lines:
+            return 0
+        if _base(lines[0]) != file_hash(self.xlsx_path):
+            # xlsx sudah berubah dari luar (mis. git pull): op berbasis nomor baris tidak bisa dipakai
+            self.set_aside()
+            return 0
+        good = len(lines[0])
+        for line in lines[1:]:
+            try:
+                op = json.loads(line)
+            except ValueError:
+                break  # baris terakhir terpotong karena crash
+            try:
+                apply_journal_op(wb, op)
+                self.kinds.add(op["op"])
+            except Exception:
+                self.set_aside()
+                return None
+            good += len(line)
+            self.count += 1
+        if good < sum(len(l) for l in lines):
+            with open(self.path, "r+b") as f:
+                f.truncate(good)
+        return self.count
+
+    def base(self):
+        """sha1 xlsx tempat journal ini dimulai, None kalau belum ada journal."""
+        try:
+            with open(self.path, "rb") as f:
+                return _base(f.readline())
+        except OSError:
+            return None
+
+    def reset(self):
+        """Dipanggil setelah isi journal sudah tersimpan di xlsx."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.count = 0
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def set_aside(self):
+        """Pindahkan journal ke .orphan-* (tidak diterapkan lagi); kembalikan path barunya."""
+        self.close()
+        self.count = 0
+        orphan = f"{self.path}.orphan-{datetime.datetime.now():%Y%m%d%H%M%S}"
+        try:
+            os.replace(self.path, orphan)
+        except OSError:
+            return None
+        return orphan
+
+
+def _base(line):
+    try:
+        return json.loads(line)["base"]
+    except (ValueError, KeyError, TypeError):
+        return None
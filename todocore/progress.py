@@ -0,0 +1,284 @@
+"""Progress todo: pembaca XML streaming, index progress di disk dan scan paralel."""
+import os
+import json
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+
+from .config import INDEX_PATH
+from .workbook import count_workbook_sections, file_hash, file_signature
+
+
+# ===== Streaming Progress Reader =====
+# Baca langsung XML di dalam zip .xlsx, cukup kolom A (Task) & B (Status),
+# tanpa membangun object model openpyxl (style, cell, dst).
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def _xlsx_part(base, target):
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(base, target))
+
+
+def _read_shared_strings(zf, name):
+    if name not in zf.namelist():
+        return []
+    strings = []
+    with zf.open(name) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag == _NS_MAIN + "si":
+                strings.append("".join(t.text or "" for t in elem.iter(_NS_MAIN + "t")))
+                elem.clear()
+    return strings
+
+
+def _col_index(ref):
+    """'B12' -> 2 (1-based)."""
+    col = 0
+    for ch in ref:
+        if "A" <= ch <= "Z":
+            col = col * 26 + (ord(ch) - 64)
+        else:
+            break
+    return col
+
+
+def _cell_value(cell, strings):
+    """Nilai sel mengikuti tipe openpyxl secukupnya (str, float, bool, None)."""
+    t = cell.get("t", "n")
+    if t == "inlineStr":
+        return "".join(x.text or "" for x in cell.iter(_NS_MAIN + "t"))
+    v = cell.find(_NS_MAIN + "v")
+    if v is None or v.text is None:
+        return None
+    if t == "s":
+        return strings[int(v.text)]
+    if t == "b":
+        return v.text == "1"
+    if t in ("str", "e", "d"):
+        return v.text
+    return float(v.text)
+
+
+def _count_sheet_xml(f, strings):
+    total, done, row_no = 0, 0, 0
+    sheet_data = None
+    for event, elem in ET.iterparse(f, events=("start", "end")):
+        if event == "start":
+            if elem.tag == _NS_MAIN + "sheetData":
+                sheet_data = elem
+            continue
+        if elem.tag != _NS_MAIN + "row":
+            continue
+        row_no = int(elem.get("r", row_no + 1))
+        if row_no >= 2:  # baris 1 = header
+            task = status = None
+            for pos, cell in enumerate(elem.iter(_NS_MAIN + "c"), start=1):
+                ref = cell.get("r")
+                col = _col_index(ref) if ref else pos
+                if col == 1:
+                    task = _cell_value(cell, strings)
+                elif col == 2:
+                    status = _cell_value(cell, strings)
+            if task and str(task).strip() != "":
+                total += 1
+                if status in (1, "1", True):
+                    done += 1
+        # buang baris yang sudah diproses supaya memori tetap kecil
+        elem.clear()
+        if sheet_data is not None:
+            sheet_data.remove(elem)
+    return total, done
+
+
+def stream_section_progress(path):
+    """{nama_sheet: [total, selesai]} dengan membaca XML worksheet secara streaming."""
+    with zipfile.ZipFile(path) as zf:
+        wb_xml = ET.fromstring(zf.read("xl/workbook.xml"))
+        rels_xml = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+        targets, shared = {}, "xl/sharedStrings.xml"
+        for rel in rels_xml.iter(_NS_PKG_REL + "Relationship"):
+            part = _xlsx_part("xl", rel.get("Target", ""))
+            targets[rel.get("Id")] = part
+            if rel.get("Type", "").endswith("/sharedStrings"):
+                shared = part
+        strings = _read_shared_strings(zf, shared)
+        sections = {}
+        for sheet in wb_xml.iter(_NS_MAIN + "sheet"):
+            with zf.open(targets[sheet.get(_NS_REL + "id")]) as f:
+                sections[sheet.get("name")] = list(_count_sheet_xml(f, strings))
+    return sections
+
+
+def calc_section_progress(path):
+    try:
+        return stream_section_progress(path)
+    except Exception:
+        pass  # format di luar dugaan, pakai openpyxl saja
+    try:
+        import openpyxl
+
+        wb = openpyxl.load_workbook(path, read_only=True)
+    except Exception:
+        return {}
+    try:
+        return count_workbook_sections(wb)
+    finally:
+        wb.close()
+
+
+def progress_percent(sections) -> int:
+    total = sum(t for t, _ in sections.values())
+    done = sum(d for _, d in sections.values())
+    if total == 0:
+        return 0
+    return int((done / total) * 100)
+
+
+def calc_todo_progress(path) -> int:
+    return progress_percent(calc_section_progress(path))
+
+
+# ===== Progress Index =====
+class ProgressIndex:
+    """
+    Index progress per file & per section yang disimpan di DATA_DIR/.index (JSON).
+    Entry valid kalau (mtime, size) sama; kalau beda, dicek hash isinya dulu
+    sebelum file di-scan ulang. Jadi refresh sidebar cukup satu stat per file.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.files = {}  # nama file -> {"mtime", "size", "hash", "sections"}
+        self.live = {}  # nama file -> sections dari workbook di memori yang belum tersimpan
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == self.VERSION:
+            self.files = data.get("files", {})
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "files": self.files}, f)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError:
+            pass  # index hanya cache, gagal simpan tidak fatal
+
+    def lookup(self, path, check_hash=True):
+        """Sections dari index kalau masih valid, None kalau file perlu di-scan."""
+        if os.path.basename(path) in self.live:
+            return self.live[os.path.basename(path)]
+        sig = file_signature(path)
+        if sig is None:
+            self.forget(path)
+            return {}
+        entry = self.files.get(os.path.basename(path))
+        if entry is None:
+            return None
+        if (entry["mtime"], entry["size"]) == sig:
+            return entry["sections"]
+        if check_hash and entry["hash"] == file_hash(path):
+            entry["mtime"], entry["size"] = sig
+            self.dirty = True
+            return entry["sections"]
+        return None
+
+    def known_hash(self, path):
+        entry = self.files.get(os.path.basename(path))
+        return entry["hash"] if entry else None
+
+    def sections(self, path):
+        """{section: [total, selesai]} untuk file, scan ulang hanya kalau berubah."""
+        sections = self.lookup(path)
+        if sections is None:
+            sig, digest, sections = scan_todo_file(path)
+            self.store(path, sig, digest, sections)
+        return sections
+
+    def set_live(self, path, sections):
+        self.live[os.path.basename(path)] = sections
+
+    def clear_live(self, path):
+        self.live.pop(os.path.basename(path), None)
+
+    def forget(self, path):
+        if self.files.pop(os.path.basename(path), None) is not None:
+            self.dirty = True
+
+    def prune(self, keep_names):
+        """Buang entry untuk file yang sudah tidak ada."""
+        for key in [k for k in self.files if k not in keep_names]:
+            del self.files[key]
+            self.dirty = True
+
+    def store(self, path, sig, digest, sections):
+        """Simpan hasil scan. sections=None artinya isi file sama (hash cocok)."""
+        key = os.path.basename(path)
+        if sig is None:
+            self.forget(path)
+            return
+        if sections is None:
+            sections = self.files.get(key, {}).get("sections", {})
+        self.files[key] = {"mtime": sig[0], "size": sig[1], "hash": digest, "sections": sections}
+        self.dirty = True
+
+
+# ===== Parallel Scan =====
+def scan_todo_file(path, known_hash=None):
+    """
+    (signature, hash, sections) untuk satu file; dipakai juga di process worker.
+    Kalau hash sama dengan known_hash, sections=None (tidak perlu di-scan).
+    """
+    sig = file_signature(path)
+    if sig is None:
+        return None, None, {}
+    digest = file_hash(path)
+    if known_hash is not None and digest == known_hash:
+        return sig, digest, None
+    return sig, digest, calc_section_progress(path)
+
+
+def scan_progress_parallel(jobs, on_result, max_workers=None):
+    """
+    Hitung progress banyak file di process pool (default: sebanyak CPU).
+    jobs: list (path, known_hash). on_result(path, sig, hash, sections)
+    dipanggil dari thread pemanggil begitu tiap file selesai.
+    """
+    jobs = list(jobs)
+    finished = set()
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        try:
+            # concurrent.futures.process ikut memuat multiprocessing; cukup saat scan pertama
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(scan_todo_file, p, h): p for p, h in jobs}
+                for fut in as_completed(futures):
+                    try:
+                        result = fut.result()
+                    except Exception:
+                        continue  # dicoba lagi secara serial di bawah
+                    on_result(futures[fut], *result)
+                    finished.add(futures[fut])
+        except Exception:
+            pass  # process pool tidak bisa jalan (mis. exe beku), sisanya serial
+    for path, known in jobs:
+        if path not in finished:
+            on_result(path, *scan_todo_file(path, known))
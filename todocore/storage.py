@@ -0,0 +1,1086 @@
+"""Penyimpanan todo: interface TodoStore dengan backend xlsx dan SQLite."""
+import os
+import sqlite3
+import weakref
+import threading
+from collections import namedtuple
+
+from .config import DATA_DIR, HEADER, ID_COL, JOURNAL_COMPACT_OPS, SQLITE_PATH, STORE_BACKEND
+from .dates import DateIndex, date_range
+from .events import EventBus
+from .git import WrittenFiles
+from .journal import TodoJournal, apply_journal_op
+from .progress import ProgressIndex, scan_progress_parallel
+from .workbook import (
+    SaveQueue,
+    WorkbookCache,
+    count_row,
+    count_workbook_sections,
+    create_new_todo_excel,
+    file_hash,
+    file_signature,
+    hide_id_column,
+    legacy_task_id,
+    new_task_id,
+    safe_unpack,
+    sheet_title_error,
+)
+
+
+# ===== Storage =====
+Task = namedtuple("Task", "key task status note tanggal")
+
+
+def normalize_status(status):
+    return 1 if status in (1, "1", True) else 0
+
+
+class TodoStore:
+    """
+    Interface penyimpanan data todo: todo (file) -> section (sheet) -> task
+    (Task/Status/Note/Tanggal). TodoApp hanya bicara lewat method di sini.
+
+    Task.key adalah ID task yang stabil (tidak berubah walau task di-rename
+    atau baris bergeser), dipakai sebagai kunci di UI, index dan export.
+
+    Perubahan diumumkan lewat self.events (EventBus), boleh dari thread lain:
+      progress(todo, sections)                 progress satu todo berubah
+      save_state(state, detail)                "pending" / "saving" / "saved" / "error"
+      todo_created / todo_deleted / todo_imported(todo), todo_renamed(todo, new)
+      section_added / section_deleted(todo, section), section_renamed(todo, section, new)
+      task_added / task_edited / task_deleted(todo, section, key)
+      task_toggled(todo, section, key, status)
+      todo_updated(todo)                       batch di-commit (ganti semua event di atas untuk todo itu)
+    """
+
+    events = None  # EventBus, dibuat di __init__ tiap store
+    last_error = None
+    written = None  # WrittenFiles: file data yang ditulis sejak push terakhir
+    _batch = None  # nama todo yang sedang dalam batch (lihat batch)
+
+    # --- todo
+    def list_todos(self):
+        raise NotImplementedError
+
+    def exists(self, name):
+        return name in self.list_todos()
+
+    def create_todo(self, name, first_section="Default"):
+        raise NotImplementedError
+
+    def rename_todo(self, name, new_name):
+        """OSError kalau perubahan todo belum bisa disimpan; todo tetap dengan nama lama."""
+        raise NotImplementedError
+
+    def delete_todo(self, name):
+        raise NotImplementedError
+
+    # --- section
+    def sections(self, name):
+        raise NotImplementedError
+
+    def add_section(self, name, section):
+        """ValueError kalau nama section tidak valid sebagai nama sheet (lihat sheet_title_error)."""
+        raise NotImplementedError
+
+    def rename_section(self, name, section, new_section):
+        raise NotImplementedError
+
+    def delete_section(self, name, section):
+        raise NotImplementedError
+
+    # --- task
+    def tasks(self, name, section, month=None, start=None, end=None):
+        """
+        List Task di section (task kosong dilewati), urut seperti di sheet.
+        Opsional hanya bulan 'YYYY-MM', atau rentang tanggal start..end
+        (inklusif, lihat date_range; start == end == 'YYYY-MM-DD' untuk satu hari).
+        """
+        raise NotImplementedError
+
+    def months(self, name, section):
+        """Daftar 'YYYY-MM' yang dipakai di section, terurut."""
+        raise NotImplementedError
+
+    def get_task(self, name, section, key):
+        raise NotImplementedError
+
+    def add_task(self, name, section, task, note="", tanggal="", status=0, task_id=None):
+        """Tambah task; kembalikan ID-nya (dibuat baru kalau task_id kosong)."""
+        raise NotImplementedError
+
+    def edit_task(self, name, section, key, task, note, tanggal):
+        raise NotImplementedError
+
+    def set_status(self, name, section, key, status):
+        raise NotImplementedError
+
+    def delete_task(self, name, section, key):
+        raise NotImplementedError
+
+    def move_task(self, name, section, key, new_section):
+        """Pindahkan task ke section lain, ID tetap (event task_deleted + task_added)."""
+        t = self.get_task(name, section, key)
+        if t is None:
+            return
+        self.delete_task(name, section, key)
+        self.add_task(name, new_section, t.task, t.note, t.tanggal, t.status, task_id=key)
+
+    def todo_file(self, name):
+        """File yang menyimpan todo ini (untuk badge git), None kalau bukan satu file per todo."""
+        return None
+
+    # --- progress
+    def cached_progress(self, name):
+        """{section: [total, selesai]} kalau bisa didapat murah, None kalau perlu di-scan."""
+        raise NotImplementedError
+
+    def scan_progress(self, names, on_result=None):
+        """
+        Hitung progress todo yang belum ada di cache (blocking, jalankan di thread).
+        Hasil ke on_result(name, sections), default event "progress".
+        """
+        on_result = on_result or self._emit_progress
+        for name in names:
+            on_result(name, self.cached_progress(name) or {})
+
+    # --- bulk
+    def export_todo(self, name):
+        """{section: [(task, status, note, tanggal, id), ...]} berurutan."""
+        raise NotImplementedError
+
+    def import_todo(self, name, data):
+        """Ganti seluruh isi todo dengan data hasil export_todo."""
+        raise NotImplementedError
+
+    # --- batch
+    def batch(self, name):
+        """
+        Buka transaksi untuk banyak perubahan pada satu todo:
+
+            with store.batch("Kerja") as b:
+                key = b.add_task("Default", "Task baru")
+                b.set_status("Default", key, 1)
+
+        Semua perubahan disimpan sekali saat blok selesai (commit), atau
+        dibatalkan semuanya kalau ada exception (rollback). Selama batch, store
+        dikunci untuk thread lain dan event per task tidak dikirim; gantinya
+        satu todo_updated(todo) setelah commit.
+        """
+        return TodoBatch(self, name)
+
+    def _begin_batch(self, name):
+        raise NotImplementedError
+
+    def _end_batch(self, name, commit):
+        raise NotImplementedError
+
+    # --- lifecycle
+    def flush(self, timeout=None):
+        """Pastikan semua perubahan sudah di disk. False kalau ada yang gagal (atau timeout habis)."""
+        return True
+
+    def hold_saves(self):
+        """Jangan tulis file data sampai release_saves (git sedang membaca/menulisnya)."""
+
+    def release_saves(self):
+        """
+        Lanjutkan menulis. File yang diganti git sementara perubahannya belum
+        tersimpan tidak ditimpa: perubahan itu disisihkan dan dilaporkan (save_state "error").
+        """
+
+    def written_paths(self):
+        """File data yang ditulis sejak push terakhir (path absolut)."""
+        return self.written.snapshot() if self.written else []
+
+    def forget_written(self, paths):
+        """Dipanggil setelah push berhasil untuk paths yang ikut di-commit."""
+        if self.written:
+            self.written.discard(paths)
+
+    def _wrote(self, *paths):
+        if self.written:
+            self.written.add(*paths)
+
+    def close(self, timeout=None):
+        pass
+
+    def _emit(self, event, **data):
+        if self._batch is not None and data.get("todo") == self._batch:
+            return  # diganti satu todo_updated saat batch di-commit
+        if self.events:
+            self.events.emit(event, **data)
+
+    def _check_section(self, section):
+        error = sheet_title_error(section)
+        if error:
+            raise ValueError(error)
+
+    def _emit_progress(self, name, sections):
+        self._emit("progress", todo=name, sections=sections)
+
+    def _emit_state(self, state, detail=""):
+        self._emit("save_state", state=state, detail=detail)
+
+
+class TodoBatch:
+    """
+    Transaksi pada satu todo, dibuat lewat TodoStore.batch. Method-nya sama
+    dengan TodoStore tanpa argumen nama todo. Dipakai sebagai context manager,
+    atau panggil commit()/rollback() sendiri.
+    """
+
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+        store._begin_batch(name)
+        self._open = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._open:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        return False
+
+    def commit(self):
+        self._finish(True)
+
+    def rollback(self):
+        self._finish(False)
+
+    def _finish(self, commit):
+        if not self._open:
+            raise RuntimeError(f"batch {self.name} sudah selesai")
+        self._open = False
+        self.store._end_batch(self.name, commit)
+
+    # --- baca (melihat perubahan batch yang belum di-commit)
+    def sections(self):
+        return self.store.sections(self.name)
+
+    def tasks(self, section, month=None, start=None, end=None):
+        return self.store.tasks(self.name, section, month=month, start=start, end=end)
+
+    def get_task(self, section, key):
+        return self.store.get_task(self.name, section, key)
+
+    # --- ubah
+    def add_section(self, section):
+        self.store.add_section(self.name, section)
+
+    def rename_section(self, section, new_section):
+        self.store.rename_section(self.name, section, new_section)
+
+    def delete_section(self, section):
+        self.store.delete_section(self.name, section)
+
+    def add_task(self, section, task, note="", tanggal="", status=0, task_id=None):
+        return self.store.add_task(self.name, section, task, note, tanggal, status, task_id)
+
+    def edit_task(self, section, key, task, note, tanggal):
+        self.store.edit_task(self.name, section, key, task, note, tanggal)
+
+    def set_status(self, section, key, status):
+        self.store.set_status(self.name, section, key, status)
+
+    def delete_task(self, section, key):
+        self.store.delete_task(self.name, section, key)
+
+    def move_task(self, section, key, new_section):
+        self.store.move_task(self.name, section, key, new_section)
+
+
+def copy_todos(src, dst, names=None):
+    """Salin todo (semua atau sebagian) dari satu store ke store lain. Kembalikan jumlahnya."""
+    names = list(names) if names is not None else src.list_todos()
+    for name in names:
+        dst.import_todo(name, src.export_todo(name))
+    dst.flush()
+    return len(names)
+
+
+def migrate(to_sqlite, data_dir=DATA_DIR, sqlite_path=SQLITE_PATH):
+    """Salin semua todo xlsx -> SQLite (to_sqlite) atau sebaliknya. Kembalikan jumlahnya."""
+    xlsx, sqlite = XlsxTodoStore(data_dir), SqliteTodoStore(sqlite_path)
+    src, dst = (xlsx, sqlite) if to_sqlite else (sqlite, xlsx)
+    try:
+        return copy_todos(src, dst)
+    finally:
+        xlsx.close()
+        sqlite.close()
+
+
+class XlsxTodoStore(TodoStore):
+    """
+    Store bawaan: satu file .xlsx per todo di data_dir, satu sheet per section.
+    Workbook di-cache (WorkbookCache), tiap mutasi dicatat di TodoJournal lalu
+    dipadatkan ke xlsx oleh SaveQueue setelah jeda tenang (atau segera begitu
+    journal mencapai JOURNAL_COMPACT_OPS op); progress sidebar dari ProgressIndex.
+
+    Selama batch, op langsung diterapkan ke workbook tapi baru ditulis ke
+    journal saat commit (satu fsync, satu simpan); rollback membuang workbook
+    dari cache sehingga dimuat ulang dari xlsx + journal.
+
+    Task dikenali lewat kolom ID (tersembunyi); baris lama tanpa ID diberi ID
+    saat sheet pertama kali dibuka. Posisi task dicari lewat index per sheet
+    (ID -> nomor baris) yang dibangun sekali lalu diperbarui tiap add/hapus. Hapus task hanya
+    mengosongkan baris ("clear") supaya nomor baris lain tidak bergeser;
+    baris kosong dibuang sekali saat workbook disimpan ("compact").
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        os.makedirs(data_dir, exist_ok=True)
+        self.events = EventBus()
+        self.cache = WorkbookCache(on_load=self._on_loaded)
+        self.journals = {}
+        self.index = ProgressIndex(os.path.join(data_dir, ".index"))
+        self.written = WrittenFiles(os.path.join(data_dir, ".written"))
+        self._index_lock = threading.Lock()
+        self._scanning = set()
+        self._row_index = weakref.WeakKeyDictionary()  # worksheet -> {ID task: baris}
+        self._cleared = weakref.WeakSet()  # worksheet yang punya baris "clear" belum dipadatkan
+        self._progress = weakref.WeakKeyDictionary()  # workbook -> {section: [total, selesai]}
+        self._date_index = weakref.WeakKeyDictionary()  # worksheet -> DateIndex
+        self._batch_ops = []  # op batch yang belum masuk journal
+        self.save_queue = SaveQueue(
+            self.cache,
+            on_state=lambda *a: self._emit_state(*a),
+            on_saved=self._on_saved,
+            prepare=self._prepare_save,
+        )
+
+    @property
+    def last_error(self):
+        return self.save_queue.last_error
+
+    def path(self, name):
+        return os.path.join(self.data_dir, f"{name}.xlsx")
+
+    def _name(self, path):
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def _journal(self, path):
+        path = os.path.abspath(path)
+        if path not in self.journals:
+            self.journals[path] = TodoJournal(path)
+        return self.journals[path]
+
+    def _workbook(self, name):
+        return self.cache.get(self.path(name))
+
+    def _apply(self, name, op):
+        """
+        Terapkan op ke workbook di memori lalu catat di journal (fsync). Op yang
+        gagal diterapkan tidak pernah masuk journal (replay akan berhenti di sana).
+        """
+        path = self.path(name)
+        with self.cache.lock:
+            wb = self.cache.get(path)
+            journal = self._journal(path)
+            sections = self._progress.get(wb)
+            if sections is not None and op["op"] in ("add", "edit", "toggle", "clear"):
+                # op satu baris: geser hitungan lama, jangan hitung ulang seluruh workbook
+                ws = wb[op["sheet"]]
+                before = (0, 0) if op["op"] == "add" else count_row(ws, op["row"])
+                apply_journal_op(wb, op)
+                after = count_row(ws, ws.max_row if op["op"] == "add" else op["row"])
+                counts = sections.setdefault(ws.title, [0, 0])
+                counts[0] += after[0] - before[0]
+                counts[1] += after[1] - before[1]
+            else:
+                apply_journal_op(wb, op)
+                sections = self._progress[wb] = count_workbook_sections(wb)
+            self.cache.mark_dirty(path)
+            if self._batch == name:
+                self._batch_ops.append(op)  # masuk journal saat commit
+                return
+            try:
+                journal.append(op)
+            except Exception:
+                # perubahan di memori tidak tercatat: buang, muat ulang dari xlsx + journal
+                self.save_queue.discard(path)
+                self.cache.invalidate(path)
+                raise
+            sections = {title: list(counts) for title, counts in sections.items()}
+        with self._index_lock:
+            self.index.set_live(path, sections)
+        self._emit_progress(name, sections)
+        # tiap op dijadwalkan; SaveQueue menggabungkannya jadi satu simpan setelah jeda tenang,
+        # kecuali journal sudah terlalu panjang (edit tanpa henti): padatkan sekarang
+        self.save_queue.schedule(path, wb, now=journal.count >= JOURNAL_COMPACT_OPS)
+        self._emit_state("pending", f"{journal.count} perubahan di journal")
+
+    def _on_loaded(self, path, wb):
+        # sisa journal (app sempat crash) diterapkan lagi lalu dipadatkan di background
+        journal = self._journal(path)
+        count = journal.replay(wb)
+        if count is None:
+            return False  # replay gagal di tengah: WorkbookCache memuat ulang xlsx tanpa journal
+        if count:
+            if "clear" in journal.kinds:
+                self._cleared.update(wb.worksheets)
+            self.cache.mark_dirty(path)
+            self.save_queue.schedule(path, wb)
+
+    def _prepare_save(self, path, wb):
+        # thread SaveQueue, cache.lock dipegang: buang baris bekas "clear" lewat journal juga
+        replaced = self._drop_replaced(path)
+        if replaced:
+            raise OSError(replaced)  # jangan timpa isi baru; simpan ini dibatalkan
+        sheets = [ws.title for ws in wb.worksheets if ws in self._cleared]
+        if sheets:
+            op = {"op": "compact", "sheets": sheets}
+            self._journal(path).append(op)
+            apply_journal_op(wb, op)
+            for ws in wb.worksheets:
+                self._cleared.discard(ws)
+                self._row_index.pop(ws, None)  # nomor baris bergeser, bangun ulang nanti
+
+    def _on_saved(self, path, wb):
+        # thread SaveQueue, cache.lock masih dipegang: isi journal sudah ada di xlsx
+        self._journal(path).reset()
+        self._wrote(path)
+        sections = count_workbook_sections(wb)
+        sig, digest = file_signature(path), file_hash(path)
+        with self._index_lock:
+            self.index.store(path, sig, digest, sections)
+            if not self.cache.is_dirty(path):
+                self.index.clear_live(path)
+            self.index.save()
+        self._emit_progress(self._name(path), sections)
+
+    def _drop_replaced(self, path):
+        """
+        xlsx diganti dari luar (mis. git pull) padahal workbook di cache masih
+        punya perubahan: menyimpannya akan menimpa isi baru. Seperti replay
+        dengan base berbeda, journal disisihkan (.orphan-*) dan workbook dimuat
+        ulang dari disk. Kembalikan pesan untuk user, None kalau tidak ada konflik.
+        Pegang cache.lock.
+        """
+        if not (self.cache.is_dirty(path) and self.cache.replaced(path)):
+            return None
+        exists = os.path.exists(path)
+        journal = self._journal(path)
+        if exists and journal.base() == file_hash(path):
+            return None  # isi file sama, hanya mtime yang berubah
+        orphan = journal.set_aside()
+        self.save_queue.discard(path)
+        self.cache.invalidate(path)
+        with self._index_lock:
+            self.index.clear_live(path)
+        name = self._name(path)
+        if exists:
+            self._emit_progress(name, count_workbook_sections(self.cache.get(path)))
+            self._emit("todo_updated", todo=name)
+        else:
+            self._emit("todo_deleted", todo=name)
+        kept = f"; perubahan yang belum tersimpan disisihkan ke {os.path.basename(orphan)}" if orphan else ""
+        return f"{name}.xlsx berubah di luar app (mis. git pull){kept}"
+
+    def _rows_by_id(self, name, ws):
+        """Index ID -> baris untuk ws; baris bertask tanpa ID langsung diberi ID."""
+        index = self._row_index.get(ws)
+        if index is None:
+            index, missing = {}, []
+            for i, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+                task, _, _, _, task_id = safe_unpack(row, ID_COL)
+                if not task:
+                    continue
+                if task_id:
+                    index[str(task_id)] = i
+                else:
+                    missing.append([i, legacy_task_id(name, ws.title, i, task)])
+            if ws.max_row == 1 and all(c.value is None for c in ws[1]):
+                self._apply(name, {"op": "header", "sheet": ws.title})  # sheet dibuat manual tanpa header
+            elif missing or ws.cell(row=1, column=ID_COL).value != HEADER[ID_COL - 1]:
+                self._apply(name, {"op": "assign_ids", "sheet": ws.title, "ids": missing})
+                index.update((task_id, i) for i, task_id in missing)
+            self._row_index[ws] = index
+        return index
+
+    def _find_row(self, name, ws, key):
+        return self._rows_by_id(name, ws).get(key)
+
+    def _dates(self, name, ws):
+        """DateIndex untuk ws, dibangun sekali lalu diperbarui tiap add/edit/hapus."""
+        index = self._date_index.get(ws)
+        if index is None:
+            self._rows_by_id(name, ws)
+            index = DateIndex()
+            for row in ws.iter_rows(min_row=2, values_only=True):
+                task, _, _, tanggal, task_id = safe_unpack(row, ID_COL)
+                if task and task_id:
+                    index.put(str(task_id), tanggal)
+            self._date_index[ws] = index
+        return index
+
+    def _task_at(self, ws, row, key):
+        """Task di baris row, None kalau task-nya kosong (sudah dihapus)."""
+        task, status, note, tanggal = (ws.cell(row=row, column=c).value for c in range(1, 5))
+        if not task:
+            return None
+        return Task(key, str(task), int(status) if status else 0, note or "", tanggal or "")
+
+    # --- todo
+    def list_todos(self):
+        with os.scandir(self.data_dir) as it:
+            files = sorted(e.name for e in it if e.name.lower().endswith(".xlsx") and e.is_file())
+        with self._index_lock:
+            self.index.prune(set(files))
+            self.index.save()
+        return [os.path.splitext(f)[0] for f in files]
+
+    def exists(self, name):
+        return os.path.exists(self.path(name))
+
+    def todo_file(self, name):
+        return os.path.abspath(self.path(name))
+
+    def create_todo(self, name, first_section="Default"):
+        create_new_todo_excel(self.path(name), first_section)
+        self._wrote(self.path(name))
+        self._emit("todo_created", todo=name)
+
+    def rename_todo(self, name, new_name):
+        old_path, new_path = self.path(name), self.path(new_name)
+        # journal menempel di nama file lama: rename hanya kalau semuanya sudah masuk xlsx
+        if not self.flush() or self.cache.is_dirty(old_path):
+            raise OSError(f"{name} belum tersimpan, rename dibatalkan: {self.last_error}")
+        journal = self.journals.pop(os.path.abspath(old_path), None)
+        if journal is not None:
+            journal.close()
+        os.rename(old_path, new_path)
+        self.cache.invalidate(old_path)
+        self._wrote(old_path, new_path)
+        self._emit("todo_renamed", todo=name, new=new_name)
+
+    def delete_todo(self, name):
+        path = self.path(name)
+        self.save_queue.discard(path)
+        self.save_queue.flush()
+        self._journal(path).reset()
+        self.journals.pop(os.path.abspath(path), None)
+        os.remove(path)
+        self.cache.invalidate(path)
+        self._wrote(path)
+        with self._index_lock:
+            self.index.forget(path)
+            self.index.clear_live(path)
+        self._emit("todo_deleted", todo=name)
+
+    # --- section
+    def sections(self, name):
+        return list(self._workbook(name).sheetnames)
+
+    def add_section(self, name, section):
+        self._check_section(section)
+        self._apply(name, {"op": "add_section", "sheet": section})
+        self._emit("section_added", todo=name, section=section)
+
+    def rename_section(self, name, section, new_section):
+        self._check_section(new_section)
+        self._apply(name, {"op": "rename_section", "sheet": section, "new": new_section})
+        self._emit("section_renamed", todo=name, section=section, new=new_section)
+
+    def delete_section(self, name, section):
+        self._apply(name, {"op": "delete_section", "sheet": section})
+        self._emit("section_deleted", todo=name, section=section)
+
+    # --- task
+    def tasks(self, name, section, month=None, start=None, end=None):
+        if month:
+            start = end = month
+        with self.cache.lock:
+            ws = self._workbook(name)[section]
+            index = self._rows_by_id(name, ws)
+            if start or end:
+                # hanya baris yang lolos DateIndex yang dibaca, urut nomor baris
+                rows = sorted((index[key], key) for key in self._dates(name, ws).between(start, end) if key in index)
+                return [t for t in (self._task_at(ws, row, key) for row, key in rows) if t]
+            rows = list(ws.iter_rows(min_row=2, values_only=True))
+        result = []
+        for row in rows:
+            task, status, note, tanggal, task_id = safe_unpack(row, ID_COL)
+            if not task:
+                continue
+            result.append(Task(str(task_id), str(task), int(status) if status else 0, note or "", tanggal or ""))
+        return result
+
+    def months(self, name, section):
+        with self.cache.lock:
+            return self._dates(name, self._workbook(name)[section]).months()
+
+    def get_task(self, name, section, key):
+        with self.cache.lock:
+            ws = self._workbook(name)[section]
+            row = self._find_row(name, ws, key)
+            if row is None:
+                return None
+            return self._task_at(ws, row, key)
+
+    def add_task(self, name, section, task, note="", tanggal="", status=0, task_id=None):
+        task_id = task_id or new_task_id()
+        with self.cache.lock:
+            ws = self._workbook(name)[section]
+            index = self._rows_by_id(name, ws)  # sheet tanpa header dapat header di sini
+            self._apply(name, {"op": "add", "sheet": section, "row": [task, status, note, tanggal, task_id]})
+            index[task_id] = ws.max_row
+            if ws in self._date_index:
+                self._date_index[ws].put(task_id, tanggal)
+        self._emit("task_added", todo=name, section=section, key=task_id)
+        return task_id
+
+    def edit_task(self, name, section, key, task, note, tanggal):
+        with self.cache.lock:
+            ws = self._workbook(name)[section]
+            row = self._find_row(name, ws, key)
+            if row is None:
+                return
+            self._apply(name, {"op": "edit", "sheet": section, "row": row, "task": task, "note": note, "tanggal": tanggal})
+            if ws in self._date_index:
+                self._date_index[ws].put(key, tanggal if task else "")
+        self._emit("task_edited", todo=name, section=section, key=key)
+
+    def set_status(self, name, section, key, status):
+        with self.cache.lock:
+            ws = self._workbook(name)[section]
+            row = self._find_row(name, ws, key)
+            if row is None:
+                return
+            self._apply(name, {"op": "toggle", "sheet": section, "row": row, "status": status})
+        self._emit("task_toggled", todo=name, section=section, key=key, status=status)
+
+    def delete_task(self, name, section, key):
+        with self.cache.lock:
+            ws = self._workbook(name)[section]
+            row = self._find_row(name, ws, key)
+            if row is None:
+                return
+            self._apply(name, {"op": "clear", "sheet": section, "row": row})
+            self._rows_by_id(name, ws).pop(key, None)
+            self._cleared.add(ws)
+            if ws in self._date_index:
+                self._date_index[ws].remove(key)
+        self._emit("task_deleted", todo=name, section=section, key=key)
+
+    # --- progress
+    def cached_progress(self, name):
+        with self._index_lock:
+            return self.index.lookup(self.path(name), check_hash=False)
+
+    def scan_progress(self, names, on_result=None):
+        on_result = on_result or self._emit_progress
+        jobs = []
+        with self._index_lock:
+            for name in names:
+                path = self.path(name)
+                if path not in self._scanning:
+                    self._scanning.add(path)
+                    jobs.append((path, self.index.known_hash(path)))
+
+        def done(path, sig, digest, sections):
+            with self._index_lock:
+                self._scanning.discard(path)
+                self.index.store(path, sig, digest, sections)
+                sections = self.index.lookup(path, check_hash=False) or {}
+            on_result(self._name(path), sections)
+
+        try:
+            scan_progress_parallel(jobs, done)
+        finally:
+            with self._index_lock:
+                self._scanning.difference_update(p for p, _ in jobs)
+                self.index.save()
+
+    # --- bulk
+    def export_todo(self, name):
+        # hanya baca: task tanpa ID diberi ID di hasil export saja, xlsx sumber tidak diubah;
+        # legacy_task_id sama dengan ID yang nanti ditulis saat sheet dibuka di app
+        with self.cache.lock:
+            wb = self._workbook(name)
+            data = {}
+            for ws in wb.worksheets:
+                rows = data[ws.title] = []
+                for i, r in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+                    task, status, note, tanggal, task_id = safe_unpack(r, ID_COL)
+                    if task:
+                        rows.append((task, status, note, tanggal, task_id or legacy_task_id(name, ws.title, i, task)))
+            return data
+
+    def import_todo(self, name, data):
+        path = self.path(name)
+        self.save_queue.discard(path)
+        self.save_queue.flush()
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        wb.remove(wb.active)
+        for section, rows in (data or {"Default": []}).items():
+            ws = wb.create_sheet(section)
+            ws.append(HEADER)
+            hide_id_column(ws)
+            for row in rows:
+                task, status, note, tanggal, task_id = safe_unpack(row, ID_COL)
+                ws.append([task, normalize_status(status), note or "", tanggal or "", task_id or new_task_id()])
+        with self.cache.lock:
+            tmp = path + ".tmp"
+            wb.save(tmp)
+            os.replace(tmp, path)
+            self._journal(path).reset()
+            self.cache.invalidate(path)
+            self._wrote(path)
+        with self._index_lock:
+            self.index.clear_live(path)
+            self.index.store(path, file_signature(path), file_hash(path), count_workbook_sections(wb))
+        self._emit("todo_imported", todo=name)
+
+    # --- batch
+    def _begin_batch(self, name):
+        # simpan ditahan dulu (bukan sebaliknya): thread SaveQueue butuh cache.lock untuk selesai
+        self.save_queue.hold()
+        self.cache.lock.acquire()
+        try:
+            if self._batch is not None:
+                raise RuntimeError(f"batch {self._batch} masih terbuka")
+            self._workbook(name)
+        except BaseException:
+            self.cache.lock.release()
+            self.save_queue.release()
+            raise
+        self._batch, self._batch_ops = name, []
+
+    def _end_batch(self, name, commit):
+        path = self.path(name)
+        ops, self._batch, self._batch_ops = self._batch_ops, None, []
+        try:
+            if commit and ops:
+                self._journal(path).extend(ops)
+        except BaseException:
+            commit = False
+            raise
+        finally:
+            if ops and not commit:
+                # workbook di memori sudah ikut berubah: buang, muat ulang dari xlsx + journal
+                self.save_queue.discard(path)
+                self.cache.invalidate(path)
+            self.cache.lock.release()
+            self.save_queue.release()
+        if not (commit and ops):
+            return
+        with self.cache.lock:
+            wb = self.cache.get(path)
+            sections = {title: list(counts) for title, counts in self._progress[wb].items()}
+        with self._index_lock:
+            self.index.set_live(path, sections)
+        self._emit_progress(name, sections)
+        self._emit("todo_updated", todo=name)
+        self.save_queue.schedule(path, wb)
+
+    # --- lifecycle
+    def flush(self, timeout=None):
+        """Padatkan semua journal ke xlsx dan tunggu selesai (paling lama timeout detik)."""
+        with self.cache.lock:
+            for path, journal in self.journals.items():
+                if journal.count:
+                    self.save_queue.schedule(path, self.cache.get(path))
+        ok = self.save_queue.flush(timeout)
+        return ok and self.save_queue.last_error is None
+
+    def hold_saves(self):
+        self.save_queue.hold()
+
+    def release_saves(self):
+        # git pull bisa mengganti xlsx yang perubahannya masih di cache: cek sebelum simpan dilepas
+        errors = []
+        with self.cache.lock:
+            for path in list(self.journals):
+                replaced = self._drop_replaced(path)
+                if replaced:
+                    errors.append(replaced)
+        self.save_queue.release()
+        if errors:
+            self._emit_state("error", "\n".join(errors))
+
+    def close(self, timeout=5):
+        # simpan yang tidak selesai dalam timeout (mis. masih ditahan git) tetap aman di journal
+        self.flush(timeout)
+        self.save_queue.close(timeout=0)
+        for journal in self.journals.values():
+            journal.close()
+        with self._index_lock:
+            self.index.save()
+
+
+class SqliteTodoStore(TodoStore):
+    """
+    Store SQLite: satu tabel tasks dengan index (todo, section), status dan
+    tanggal, jadi toggle/edit/filter cukup satu query ber-index, bukan tulis
+    ulang seluruh file. Batch = satu transaksi SQLite.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sections (
+            todo TEXT NOT NULL,
+            name TEXT NOT NULL,
+            pos INTEGER NOT NULL,
+            PRIMARY KEY (todo, name)
+        );
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            todo TEXT NOT NULL,
+            section TEXT NOT NULL,
+            task TEXT NOT NULL,
+            status INTEGER NOT NULL DEFAULT 0,
+            note TEXT NOT NULL DEFAULT '',
+            tanggal TEXT NOT NULL DEFAULT '',
+            uid TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_todo_section ON tasks (todo, section);
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_tanggal ON tasks (tanggal);
+    """
+
+    def __init__(self, path=SQLITE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.RLock()
+        self.events = EventBus()
+        self.written = WrittenFiles(path + ".written")
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(self.SCHEMA)
+            self._migrate()
+            self.db.commit()
+
+    def _migrate(self):
+        # database lama belum punya kolom uid
+        columns = [r[1] for r in self.db.execute("PRAGMA table_info(tasks)")]
+        if "uid" not in columns:
+            self.db.execute("ALTER TABLE tasks ADD COLUMN uid TEXT")
+        missing = self.db.execute("SELECT id FROM tasks WHERE uid IS NULL").fetchall()
+        self.db.executemany("UPDATE tasks SET uid = ? WHERE id = ?", [(new_task_id(), r[0]) for r in missing])
+        self.db.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_uid ON tasks (uid)")
+
+    def _query(self, sql, args=()):
+        with self.lock:
+            return self.db.execute(sql, args).fetchall()
+
+    def _write(self, name, statements):
+        """Jalankan beberapa (sql, args) dalam satu transaksi lalu kabari progress."""
+        with self.lock:
+            if self._batch is not None:
+                # ikut transaksi batch; commit/rollback di _end_batch
+                for sql, args in statements:
+                    self.db.execute(sql, args)
+                return
+        with self.lock, self.db:
+            for sql, args in statements:
+                self.db.execute(sql, args)
+        self._wrote(self.path)
+        self._emit_progress(name, self.cached_progress(name))
+
+    # --- todo
+    def list_todos(self):
+        return [r[0] for r in self._query("SELECT DISTINCT todo FROM sections ORDER BY todo")]
+
+    def exists(self, name):
+        return bool(self._query("SELECT 1 FROM sections WHERE todo = ? LIMIT 1", (name,)))
+
+    def create_todo(self, name, first_section="Default"):
+        self._write(name, [("INSERT INTO sections (todo, name, pos) VALUES (?, ?, 0)", (name, first_section))])
+        self._emit("todo_created", todo=name)
+
+    def rename_todo(self, name, new_name):
+        self._write(new_name, [
+            ("UPDATE sections SET todo = ? WHERE todo = ?", (new_name, name)),
+            ("UPDATE tasks SET todo = ? WHERE todo = ?", (new_name, name)),
+        ])
+        self._emit("todo_renamed", todo=name, new=new_name)
+
+    def delete_todo(self, name):
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM tasks WHERE todo = ?", (name,))
+            self.db.execute("DELETE FROM sections WHERE todo = ?", (name,))
+        self._wrote(self.path)
+        self._emit("todo_deleted", todo=name)
+
+    # --- section
+    def sections(self, name):
+        return [r[0] for r in self._query("SELECT name FROM sections WHERE todo = ? ORDER BY pos", (name,))]
+
+    def add_section(self, name, section):
+        self._check_section(section)  # tetap bisa diekspor ke xlsx
+        self._write(name, [(
+            "INSERT INTO sections (todo, name, pos) "
+            "SELECT ?, ?, COALESCE(MAX(pos), -1) + 1 FROM sections WHERE todo = ?",
+            (name, section, name),
+        )])
+        self._emit("section_added", todo=name, section=section)
+
+    def rename_section(self, name, section, new_section):
+        self._check_section(new_section)
+        self._write(name, [
+            ("UPDATE sections SET name = ? WHERE todo = ? AND name = ?", (new_section, name, section)),
+            ("UPDATE tasks SET section = ? WHERE todo = ? AND section = ?", (new_section, name, section)),
+        ])
+        self._emit("section_renamed", todo=name, section=section, new=new_section)
+
+    def delete_section(self, name, section):
+        self._write(name, [
+            ("DELETE FROM tasks WHERE todo = ? AND section = ?", (name, section)),
+            ("DELETE FROM sections WHERE todo = ? AND name = ?", (name, section)),
+        ])
+        self._emit("section_deleted", todo=name, section=section)
+
+    # --- task
+    def tasks(self, name, section, month=None, start=None, end=None):
+        sql = "SELECT uid, task, status, note, tanggal FROM tasks WHERE todo = ? AND section = ? AND task <> ''"
+        args = [name, section]
+        if month:
+            start = end = month
+        if start or end:
+            sql += " AND tanggal >= ? AND tanggal < ?"
+            args += date_range(start, end)
+        return [Task(*r) for r in self._query(sql + " ORDER BY id", args)]
+
+    def months(self, name, section):
+        return [r[0] for r in self._query(
+            "SELECT DISTINCT substr(tanggal, 1, 7) FROM tasks "
+            "WHERE todo = ? AND section = ? AND task <> '' AND tanggal <> '' ORDER BY 1",
+            (name, section),
+        )]
+
+    def get_task(self, name, section, key):
+        rows = self._query("SELECT uid, task, status, note, tanggal FROM tasks WHERE uid = ?", (key,))
+        return Task(*rows[0]) if rows else None
+
+    def add_task(self, name, section, task, note="", tanggal="", status=0, task_id=None):
+        task_id = task_id or new_task_id()
+        self._write(name, [(
+            "INSERT INTO tasks (todo, section, task, status, note, tanggal, uid) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, section, task, normalize_status(status), note or "", tanggal or "", task_id),
+        )])
+        self._emit("task_added", todo=name, section=section, key=task_id)
+        return task_id
+
+    def edit_task(self, name, section, key, task, note, tanggal):
+        self._write(name, [("UPDATE tasks SET task = ?, note = ?, tanggal = ? WHERE uid = ?", (task, note, tanggal, key))])
+        self._emit("task_edited", todo=name, section=section, key=key)
+
+    def set_status(self, name, section, key, status):
+        self._write(name, [("UPDATE tasks SET status = ? WHERE uid = ?", (normalize_status(status), key))])
+        self._emit("task_toggled", todo=name, section=section, key=key, status=normalize_status(status))
+
+    def delete_task(self, name, section, key):
+        self._write(name, [("DELETE FROM tasks WHERE uid = ?", (key,))])
+        self._emit("task_deleted", todo=name, section=section, key=key)
+
+    def move_task(self, name, section, key, new_section):
+        self._write(name, [("UPDATE tasks SET section = ? WHERE uid = ? AND todo = ?", (new_section, key, name))])
+        self._emit("task_deleted", todo=name, section=section, key=key)
+        self._emit("task_added", todo=name, section=new_section, key=key)
+
+    # --- progress
+    def cached_progress(self, name):
+        rows = self._query(
+            "SELECT s.name, COUNT(t.id), COALESCE(SUM(t.status = 1), 0) FROM sections s "
+            "LEFT JOIN tasks t ON t.todo = s.todo AND t.section = s.name AND trim(t.task) <> '' "
+            "WHERE s.todo = ? GROUP BY s.name ORDER BY s.pos",
+            (name,),
+        )
+        return {section: [total, done] for section, total, done in rows}
+
+    # --- bulk
+    def export_todo(self, name):
+        data = {section: [] for section in self.sections(name)}
+        for section, task, status, note, tanggal, uid in self._query(
+            "SELECT section, task, status, note, tanggal, uid FROM tasks WHERE todo = ? ORDER BY id", (name,)
+        ):
+            data.setdefault(section, []).append((task, status, note, tanggal, uid))
+        return data
+
+    def import_todo(self, name, data):
+        data = data or {"Default": []}
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM tasks WHERE todo = ?", (name,))
+            self.db.execute("DELETE FROM sections WHERE todo = ?", (name,))
+            self.db.executemany(
+                "INSERT INTO sections (todo, name, pos) VALUES (?, ?, ?)",
+                [(name, section, pos) for pos, section in enumerate(data)],
+            )
+            self.db.executemany(
+                "INSERT INTO tasks (todo, section, task, status, note, tanggal, uid) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (name, section, str(task), normalize_status(status), note or "", str(tanggal or ""), task_id or new_task_id())
+                    for section, rows in data.items()
+                    for task, status, note, tanggal, task_id in (safe_unpack(r, ID_COL) for r in rows)
+                ],
+            )
+        self._wrote(self.path)
+        self._emit_progress(name, self.cached_progress(name))
+        self._emit("todo_imported", todo=name)
+
+    # --- batch
+    def _begin_batch(self, name):
+        self.lock.acquire()
+        if self._batch is not None:
+            self.lock.release()
+            raise RuntimeError(f"batch {self._batch} masih terbuka")
+        self.db.commit()
+        self._batch = name
+
+    def _end_batch(self, name, commit):
+        try:
+            if commit:
+                self.db.commit()
+            else:
+                self.db.rollback()
+        except BaseException:
+            self.db.rollback()
+            commit = False
+            raise
+        finally:
+            self._batch = None
+            self.lock.release()
+        if not commit:
+            return
+        self._wrote(self.path)
+        self._emit_progress(name, self.cached_progress(name))
+        self._emit("todo_updated", todo=name)
+
+    # --- lifecycle
+    def flush(self, timeout=None):
+        # isi WAL dipindah ke file .db supaya yang di-commit git lengkap
+        with self.lock:
+            self.db.commit()
+            self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return True
+
+    def hold_saves(self):
+        # tulisan baru tetap masuk WAL, file .db tidak disentuh selama git jalan
+        with self.lock:
+            self.db.execute("PRAGMA wal_autocheckpoint=0")
+
+    def release_saves(self):
+        with self.lock:
+            self.db.execute("PRAGMA wal_autocheckpoint=1000")
+
+    def close(self, timeout=None):
+        with self.lock:
+            self.db.close()
+
+
+def open_store(backend=None):
+    backend = backend or STORE_BACKEND
+    if backend == "sqlite":
+        return SqliteTodoStore(SQLITE_PATH)
+    if backend == "xlsx":
+        return XlsxTodoStore(DATA_DIR)
+    raise ValueError(f"backend store tidak dikenal: {backend}")
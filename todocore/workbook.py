@@ -0,0 +1,319 @@
+"""Helper workbook xlsx: file todo baru, hitung baris, cache workbook dan simpan write-behind."""
+import os
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+
+from .config import DATA_DIR, HEADER, ID_COL
+
+
+# ===== Helpers =====
+def ensure_data_dir():
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+
+def new_task_id():
+    return uuid.uuid4().hex
+
+
+def legacy_task_id(todo, sheet, row, task):
+    """
+    ID untuk baris lama yang belum punya ID, diturunkan dari posisinya: export
+    (hanya baca) dan pemberian ID saat sheet dibuka memberi ID yang sama.
+    """
+    return uuid.uuid5(uuid.NAMESPACE_URL, f"todo:{todo}/{sheet}/{row}/{task}").hex
+
+
+# openpyxl (~0,1 detik) di-import saat workbook pertama kali disentuh, bukan saat
+# modul dimuat: startup dan perintah yang hanya membaca cache/SQLite tidak membayarnya.
+def hide_id_column(ws):
+    from openpyxl.utils import get_column_letter
+
+    ws.column_dimensions[get_column_letter(ID_COL)].hidden = True
+
+
+def create_new_todo_excel(path, first_sheet_name="Default"):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = first_sheet_name
+    ws.append(HEADER)
+    hide_id_column(ws)
+    wb.save(path)
+
+
+def sheet_title_error(title):
+    """Pesan kesalahan kalau title tidak bisa dipakai sebagai nama sheet Excel, selain itu None."""
+    if not title or not title.strip():
+        return "Nama section kosong"
+    if len(title) > 31:
+        return "Nama section maksimal 31 karakter"
+    bad = sorted(set(title) & set('\\/*?:[]'))
+    if bad:
+        return f"Nama section tidak boleh berisi {' '.join(bad)}"
+    if title.startswith("'") or title.endswith("'"):
+        return "Nama section tidak boleh diawali/diakhiri tanda '"
+    return None
+
+
+def safe_unpack(row, width=4):
+    values = list(row)
+    if len(values) < width:
+        values += [""] * (width - len(values))
+    return values[:width]
+
+
+def count_sheet_rows(rows):
+    """Hitung (total, selesai) dari baris (tanpa header) sebuah sheet."""
+    total, done = 0, 0
+    for row in rows:
+        task, status, note, tanggal = safe_unpack(row)
+        if task and str(task).strip() != "":
+            total += 1
+            if status in (1, "1", True):
+                done += 1
+    return total, done
+
+
+def count_row(ws, row):
+    """(total, selesai) sumbangan satu baris sheet, aturannya sama dengan count_sheet_rows."""
+    if row < 2:
+        return 0, 0
+    return count_sheet_rows([(ws.cell(row=row, column=1).value, ws.cell(row=row, column=2).value)])
+
+
+def count_workbook_sections(wb):
+    """{nama_sheet: [total, selesai]} dari workbook yang sudah dimuat."""
+    return {
+        ws.title: list(count_sheet_rows(ws.iter_rows(min_row=2, values_only=True)))
+        for ws in wb.worksheets
+    }
+
+
+def file_signature(path):
+    """(mtime_ns, size) file, atau None kalau file tidak ada."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# ===== Workbook Cache =====
+class WorkbookCache:
+    """
+    Cache workbook openpyxl per path supaya tiap klik tidak mem-parse ulang file.
+    Entry divalidasi dengan (mtime, size); kalau file diubah dari luar app,
+    workbook dimuat ulang. Jumlah workbook yang disimpan dibatasi (LRU).
+    Workbook yang masih punya perubahan belum tersimpan (dirty) tidak pernah
+    dimuat ulang atau dibuang. Pegang `lock` selama mengubah workbook.
+    """
+
+    def __init__(self, max_entries=8, on_load=None):
+        self.max_entries = max_entries
+        self.on_load = on_load  # on_load(path, wb) dipanggil setelah workbook dibaca dari disk
+        self.lock = threading.RLock()
+        self._entries = OrderedDict()  # path -> (signature, workbook)
+        self._dirty = set()
+
+    def get(self, path):
+        key = os.path.abspath(path)
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is not None and (key in self._dirty or entry[0] == file_signature(key)):
+                self._entries.move_to_end(key)
+                return entry[1]
+            import openpyxl
+
+            wb = openpyxl.load_workbook(key)
+            if self.on_load and self.on_load(key, wb) is False:
+                wb = openpyxl.load_workbook(key)  # on_load merusak wb setengah jalan: pakai isi file apa adanya
+            self._put(key, file_signature(key), wb)
+            return wb
+
+    def save(self, path, wb):
+        key = os.path.abspath(path)
+        with self.lock:
+            # tulis ke .tmp lalu ganti sekaligus: crash di tengah simpan tidak merusak xlsx
+            # (journal masih berbasis xlsx lama); kalau gagal, entry tetap dirty dan dicoba lagi nanti
+            tmp = key + ".tmp"
+            with open(tmp, "wb") as f:
+                wb.save(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, key)
+            self._dirty.discard(key)
+            self._put(key, file_signature(key), wb)
+
+    def mark_dirty(self, path):
+        with self.lock:
+            self._dirty.add(os.path.abspath(path))
+
+    def is_dirty(self, path):
+        with self.lock:
+            return os.path.abspath(path) in self._dirty
+
+    def replaced(self, path):
+        """True kalau file di disk sudah berubah sejak workbook di cache dimuat/disimpan."""
+        key = os.path.abspath(path)
+        with self.lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] != file_signature(key)
+
+    def invalidate(self, path=None):
+        with self.lock:
+            if path is None:
+                self._entries.clear()
+                self._dirty.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+                self._dirty.discard(os.path.abspath(path))
+
+    def _put(self, key, sig, wb):
+        self._entries[key] = (sig, wb)
+        self._entries.move_to_end(key)
+        for old in list(self._entries):
+            if len(self._entries) <= self.max_entries:
+                break
+            if old not in self._dirty:
+                del self._entries[old]
+
+
+# ===== Write-behind Save =====
+class SaveQueue:
+    """
+    Simpan workbook di thread background setelah tidak ada edit selama `delay`
+    detik. Edit langsung diterapkan ke workbook di WorkbookCache; antrian ini
+    hanya menunda wb.save (tulis ulang + kompres seluruh xlsx).
+
+    on_state(state, detail) dipanggil dari thread worker dengan state
+    "pending", "saving", "saved" atau "error".
+    prepare(path, wb) dan on_saved(path, wb) dipanggil dari thread worker
+    tepat sebelum/sesudah file ditulis, sambil memegang cache.lock.
+    """
+
+    def __init__(self, cache, delay=0.8, on_state=None, on_saved=None, prepare=None):
+        self.cache = cache
+        self.delay = delay
+        self.on_state = on_state
+        self.on_saved = on_saved
+        self.prepare = prepare
+        self.last_error = None
+        self._cond = threading.Condition()
+        self._pending = {}  # path -> workbook
+        self._last_edit = 0.0
+        self._busy = False
+        self._flush_now = False
+        self._save_now = False  # schedule(now=True): simpan tanpa menunggu jeda tenang
+        self._closed = False
+        self._held = 0
+        self._thread = threading.Thread(target=self._run, name="SaveQueue", daemon=True)
+        self._thread.start()
+
+    def schedule(self, path, wb, now=False):
+        self.cache.mark_dirty(path)
+        with self._cond:
+            self._pending[os.path.abspath(path)] = wb
+            self._last_edit = time.monotonic()
+            self._save_now = self._save_now or now
+            self._cond.notify_all()
+        self._emit("pending")
+
+    def discard(self, path):
+        """Batalkan simpan yang tertunda (mis. file akan dihapus)."""
+        with self._cond:
+            self._pending.pop(os.path.abspath(path), None)
+
+    def is_idle(self):
+        with self._cond:
+            return not self._pending and not self._busy
+
+    def flush(self, timeout=None):
+        """Simpan semua yang tertunda sekarang dan tunggu sampai selesai."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_now = True
+            self._cond.notify_all()
+            while self._pending or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            self._flush_now = False
+            return not self._pending and not self._busy
+
+    def hold(self):
+        """Tahan penulisan file (mis. selama git pull/push); edit tetap diantrikan."""
+        with self._cond:
+            self._held += 1
+            self._cond.notify_all()  # worker yang sedang menunggu jeda tenang harus melihat hold ini
+            while self._busy:
+                self._cond.wait()
+
+    def release(self):
+        with self._cond:
+            self._held -= 1
+            self._cond.notify_all()
+
+    def close(self, timeout=None):
+        ok = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        return ok
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    while (not self._pending or self._held) and not self._closed:
+                        self._cond.wait()
+                    if self._closed and (self._held or not self._pending):
+                        return  # ditutup saat git masih jalan: sisa perubahan tetap di journal
+                    # tunggu sampai user berhenti mengedit sebentar
+                    while self._pending and not (self._flush_now or self._save_now or self._closed or self._held):
+                        quiet = time.monotonic() - self._last_edit
+                        if quiet >= self.delay:
+                            break
+                        self._cond.wait(self.delay - quiet)
+                    if not self._held or self._closed:
+                        break  # hold() datang selama menunggu: kembali tunggu release
+                jobs, self._pending = self._pending, {}
+                self._busy, self._save_now = True, False
+            self._emit("saving")
+            error = None
+            for path, wb in jobs.items():
+                with self.cache.lock:
+                    try:
+                        if self.prepare:
+                            self.prepare(path, wb)
+                        self.cache.save(path, wb)
+                    except Exception as e:
+                        error = f"{os.path.basename(path)}: {e}"
+                        continue
+                    if self.on_saved:
+                        self.on_saved(path, wb)
+            with self._cond:
+                self._busy = False
+                self.last_error = error
+                more = bool(self._pending)
+                self._cond.notify_all()
+            if error:
+                self._emit("error", error)
+            elif not more:
+                self._emit("saved")
+
+    def _emit(self, state, detail=""):
+        if self.on_state:
+            self.on_state(state, detail)
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()